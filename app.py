@@ -1,22 +1,821 @@
 from __future__ import annotations
+import difflib
+import gzip
+import hashlib
+import importlib
+import html
 import io
+import json
+import multiprocessing
 import os
+import pickle
+import posixpath
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import List, Tuple
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
 
-from flask import Flask, request, jsonify, send_file, render_template_string
+from flask import Flask, Request, g, has_request_context, request, jsonify, send_file
 from flask_cors import CORS
-import pandas as pd
+from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
+from werkzeug.sansio.multipart import NEED_DATA, Data, Epilogue, File, MultipartDecoder
+
+
+class _LazyModule:
+    # Stand-in that imports the module on first attribute access, so workers boot (and the UI,
+    # /metrics and report downloads run) without loading pandas/numpy
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+np = _LazyModule("numpy")
+pd = _LazyModule("pandas")
+# Imported up front by _preload(): the data stack plus the Excel engines used on upload
+PRELOAD_MODULES = ["numpy", "pandas", "openpyxl", "openpyxl.styles.numbers", "openpyxl.utils.datetime"]
 
 ALLOWED_EXTS = {".xlsx", ".xls", ".csv"}
 MAX_CONTENT_LENGTH = 200 * 1024 * 1024  # 200 MB
+CSV_CHUNKSIZE = 100_000
+XLSX_BATCH_ROWS = 20_000
+XLSX_XML_BLOCK = 1 << 20
+# Single-file uploads are decoded from the request body into a hashed temp file (CSV headers are
+# checked on the way) so repeats hit the memo before parsing. "1" instead parses sync CSVs as
+# the body arrives, at the cost of re-parsing repeats: the digest is only known at the end.
+UPLOAD_STREAMING = os.environ.get("UPLOAD_STREAMING", "") in ("1", "true")
+UPLOAD_READ_BLOCK = 64 * 1024
+UPLOAD_SNIFF_BYTES = 64 * 1024  # longer CSV header rows are neither checked early nor projected
+REPORT_CACHE_MAX_BYTES = int(os.environ.get("REPORT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+REPORT_CACHE_TTL = float(os.environ.get("REPORT_CACHE_TTL", 60 * 60))  # seconds
+# "memory" keeps summaries/upload memos per process; "sqlite" shares them between all worker
+# processes on the host through RESULT_STORE_PATH (reports already live in REPORT_DIR)
+RESULT_STORE = os.environ.get("RESULT_STORE", "memory")
+RESULT_STORE_PATH = os.environ.get("RESULT_STORE_PATH") or os.path.join(
+    tempfile.gettempdir(), "summarizer-results.sqlite3")
+REPORT_DIR = os.environ.get("REPORT_DIR") or os.path.join(tempfile.gettempdir(), "summarizer-reports")
+SUMMARY_CACHE_MAX_BYTES = int(os.environ.get("SUMMARY_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+UPLOAD_CACHE_MAX_BYTES = int(os.environ.get("UPLOAD_CACHE_MAX_BYTES", 128 * 1024 * 1024))
+TABLE_CACHE_MAX_BYTES = int(os.environ.get("TABLE_CACHE_MAX_BYTES", 128 * 1024 * 1024))
+TABLE_PAGE_MAX = 1000
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+JOB_MAX_PENDING = int(os.environ.get("JOB_MAX_PENDING", 32))
+# Most rows ?preview= summarizes in the web process before the async job reports exact results
+PREVIEW_ROWS = int(os.environ.get("PREVIEW_ROWS", 50_000))
+# Normalized uploads are kept as Parquet under DATASET_DIR/<report_key>/ (needs pyarrow;
+# DATASET_DIR="" disables) so evicted summaries can be rebuilt and rows drilled into
+DATASET_DIR = os.environ.get("DATASET_DIR", os.path.join(tempfile.gettempdir(), "summarizer-datasets"))
+DATASET_TTL = int(os.environ.get("DATASET_TTL", 7 * 24 * 3600))
+# Oldest datasets are removed once DATASET_DIR holds more than this
+DATASET_MAX_BYTES = int(os.environ.get("DATASET_MAX_BYTES", 1024 * 1024 * 1024))
+# Admission control for synchronous parses: each upload is charged an estimated peak memory
+# (file size × expansion for its type + fixed overhead) against ADMISSION_MEMORY_BYTES, at most
+# ADMISSION_MAX_ACTIVE run at once, and up to ADMISSION_MAX_QUEUE wait ADMISSION_QUEUE_TIMEOUT
+# seconds for room before getting a 503
+def _default_admission_memory() -> int:
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // 2
+    except (AttributeError, ValueError, OSError):
+        return 2 * 1024 ** 3
+
+
+ADMISSION_MEMORY_BYTES = int(os.environ.get("ADMISSION_MEMORY_BYTES", _default_admission_memory()))
+ADMISSION_MAX_ACTIVE = int(os.environ.get("ADMISSION_MAX_ACTIVE", os.cpu_count() or 2))
+ADMISSION_MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE", 16))
+ADMISSION_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", 10))
+ADMISSION_RETRY_AFTER = int(os.environ.get("ADMISSION_RETRY_AFTER", 5))
+ADMISSION_EXPANSION = {".csv": 3, ".xlsx": 12, ".xls": 8}
+ADMISSION_OVERHEAD = 32 * 1024 * 1024
+# Import PRELOAD_MODULES when the app is imported, e.g. in a forking server's master process
+# (gunicorn --preload) so workers share the pages instead of each importing pandas on first use
+PRELOAD_IMPORTS = os.environ.get("PRELOAD_IMPORTS", "") in ("1", "true")
+# Browser cache lifetime of the UI page; it is revalidated through its ETag afterwards
+UI_CACHE_MAX_AGE = int(os.environ.get("UI_CACHE_MAX_AGE", 24 * 60 * 60))  # seconds
+# Per-phase tracemalloc peaks in /metrics; costly, and shared by concurrent requests
+METRICS_TRACEMALLOC = os.environ.get("METRICS_TRACEMALLOC", "") in ("1", "true")
+# "bincount" (default) counts every row; "pivot" keeps the old pivot_table path for cross-checks
+SUMMARY_ENGINE = os.environ.get("SUMMARY_ENGINE", "bincount")
+
+REQUIRED_COLUMNS = ["Zone", "Client Name", "Order Status"]
+KEY_COLUMNS = ["Zone", "Client Name"]
+COLUMN_ALIASES = {
+    "zone": "Zone",
+    "client": "Client Name",
+    "client_name": "Client Name",
+    "order_status": "Order Status",
+    "status": "Order Status",
+    "state": "State",
+    "State": "State",
+    "tier": "Tier",
+    "Tier": "Tier",
+}
+STATUS_COLUMNS = ["Cancelled", "Completed", "HOLD", "Pending"]
+DEFAULT_ATTRS = ["State", "Tier"]
+# Low-cardinality dimensions counted into each upload's cube; /api/summary/<key>?by= rolls it up
+CUBE_DIMENSIONS = ["Zone", "State", "Tier", "Order Status"]
+STATUS_MAP = {
+    "cancelled": "Cancelled",
+    "canceled": "Cancelled",
+    "complete": "Completed",
+    "completed": "Completed",
+    "hold": "HOLD",
+    "pending": "Pending",
+}
+# Per-client reducers for attribute columns: "first" (first non-null, the default), "mode",
+# "distinct" (count of distinct values) and "conflict" (more than one distinct value)
+ATTRIBUTE_REDUCERS = ("first", "mode", "distinct", "conflict")
+# Optional JSON file extending the built-in rules, e.g.
+# {"column_aliases": {"Customer": "Client Name"}, "status_synonyms": {"Completed": ["done"]},
+#  "fold_case": true, "fold_whitespace": true, "fuzzy_cutoff": 0.85,
+#  "attributes": {"State": ["first", "conflict"], "Tier": ["first"], "Manager": ["mode"]}}
+RULES_FILE = os.environ.get("RULES_FILE", "")
+
+
+class _Rules:
+    # Column/status normalization compiled once into folded lookup tables. Status rules are
+    # applied to the distinct values of a column only (see _map_unique), never per row.
+
+    KEYS = {"column_aliases", "status_synonyms", "fold_case", "fold_whitespace", "fuzzy_cutoff",
+            "attributes"}
+
+    def __init__(self, config: dict):
+        unknown = set(config) - self.KEYS
+        if unknown:
+            raise ValueError("Unknown normalization rule keys: " + ", ".join(sorted(unknown)))
+        self.fold_case = bool(config.get("fold_case", True))
+        self.fold_whitespace = bool(config.get("fold_whitespace", True))
+        self.fuzzy_cutoff = config.get("fuzzy_cutoff")
+        self.attributes = {attr: list(reducers) for attr, reducers in config.get(
+            "attributes", {attr: ["first"] for attr in DEFAULT_ATTRS}).items()}
+        bad = {r for reducers in self.attributes.values() for r in reducers} - set(ATTRIBUTE_REDUCERS)
+        if bad:
+            raise ValueError("Unknown attribute reducers: " + ", ".join(sorted(bad)))
+
+        aliases = {c: c for c in REQUIRED_COLUMNS + list(self.attributes)}
+        aliases.update(COLUMN_ALIASES)
+        aliases.update(config.get("column_aliases", {}))
+        self.columns = {self.fold(alias): name for alias, name in aliases.items()}
+        self.names = set(self.columns.values())
+
+        synonyms = dict(STATUS_MAP)
+        for status, spellings in config.get("status_synonyms", {}).items():
+            synonyms.update({s: status for s in [status] + list(spellings)})
+        self.statuses = {self.fold(s): status for s, status in synonyms.items()}
+        self._fuzzy_keys = list(self.statuses)
+
+        # Bumped automatically whenever the rules change, so memoized results go stale
+        self.version = hashlib.sha256(json.dumps(
+            [self.columns, self.statuses, self.fold_case, self.fold_whitespace, self.fuzzy_cutoff,
+             self.attributes, REQUIRED_COLUMNS, STATUS_COLUMNS], sort_keys=True,
+        ).encode()).hexdigest()[:12]
+
+    def fold(self, text) -> str:
+        text = str(text)
+        text = " ".join(text.split()) if self.fold_whitespace else text.strip()
+        return text.casefold() if self.fold_case else text
+
+    def column(self, name) -> str:
+        return self.columns.get(self.fold(name), str(name).strip())
+
+    def status(self, value: str) -> str:
+        key = self.fold(value)
+        status = self.statuses.get(key)
+        if status is None and self.fuzzy_cutoff:
+            match = difflib.get_close_matches(key, self._fuzzy_keys, n=1, cutoff=self.fuzzy_cutoff)
+            status = self.statuses[match[0]] if match else None
+        return value if status is None else status
+
+    def resolve(self, columns) -> dict:
+        # Position -> canonical name for the columns the summaries use. When several headers
+        # fold to the same name, the one already spelled canonically wins, else the first.
+        chosen: dict = {}
+        for i, col in enumerate(columns):
+            name = self.column(col)
+            if name not in self.names:
+                continue
+            if name not in chosen or (str(col).strip() == name and
+                                      str(columns[chosen[name]]).strip() != name):
+                chosen[name] = i
+        return {i: name for name, i in chosen.items()}
+
+
+def _load_rules(path: str) -> _Rules:
+    if not path:
+        return _Rules({})
+    with open(path, encoding="utf-8") as fh:
+        return _Rules(json.load(fh))
+
+
+def _preload():
+    # Optional modules (an Excel engine may be missing) fail later on the upload that needs them
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+
+if PRELOAD_IMPORTS:
+    _preload()
+
+RULES = _load_rules(RULES_FILE)
+RULES_VERSION = RULES.version
+# Attribute columns read alongside the summary columns (DEFAULT_ATTRS unless configured)
+OPTIONAL_ATTRS = list(RULES.attributes)
+
+
+class _HashingStream:
+    # Spool target for uploaded files that hashes the bytes as Werkzeug writes them
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._sha256 = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self._sha256.update(data)
+        return self._stream.write(data)
+
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
+
+    def __iter__(self):
+        return iter(self._stream)
+
+    def __getattr__(self, name: str):
+        return getattr(self._stream, name)
+
+
+class _MultipartUpload(io.RawIOBase):
+    # The "file" part of a multipart body, decoded from the request stream block by block as it
+    # is read; nothing is spooled. The digest matches _HashingStream's once the part is consumed.
+
+    def __init__(self, stream, boundary: bytes, size: int, field: str = "file"):
+        self._stream = stream
+        self._decoder = MultipartDecoder(boundary)
+        self._sha256 = hashlib.sha256()
+        self._buffer = b""
+        self._pos = 0
+        self._open = False
+        self.size = size
+        self.filename = None
+        while self.filename is None:
+            event = self._next()
+            if isinstance(event, Epilogue):
+                return
+            if isinstance(event, File) and event.name == field:
+                self.filename = event.filename
+                self._open = True
+
+    def _next(self):
+        while True:
+            try:
+                event = self._decoder.next_event()
+            except ValueError as exc:
+                raise BadRequest(f"Malformed upload: {exc}")
+            if event is not NEED_DATA:
+                return event
+            self._decoder.receive_data(self._stream.read(UPLOAD_READ_BLOCK) or None)
+
+    def _fill(self) -> bool:
+        # Append the part's next block to the buffer; False once the part has ended
+        while self._open:
+            event = self._next()
+            if isinstance(event, Data):
+                self._open = event.more_data
+                self._sha256.update(event.data)
+                self._buffer = self._buffer[self._pos:] + event.data
+                self._pos = 0
+                return True
+        return False
+
+    def head(self) -> bytes | None:
+        # First line of the part without consuming it; None when no line break arrives within
+        # UPLOAD_SNIFF_BYTES (a cut-off header would misreport the columns)
+        while (self._buffer.find(b"\n", self._pos) < 0 and
+               len(self._buffer) - self._pos < UPLOAD_SNIFF_BYTES and self._fill()):
+            pass
+        end = self._buffer.find(b"\n", self._pos)
+        if end < 0 and self._open:
+            return None
+        return self._buffer[self._pos:end if end >= 0 else None]
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while self._pos >= len(self._buffer) and self._fill():
+            pass
+        n = min(len(b), len(self._buffer) - self._pos)
+        b[:n] = self._buffer[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def finish(self):
+        # Consume the rest of the part and the body after it (other fields, epilogue)
+        while self._fill():
+            pass
+        self._buffer, self._pos = b"", 0
+        while not isinstance(self._next(), Epilogue):
+            pass
+
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
+
+
+class _UploadRequest(Request):
+    def _get_file_stream(self, *args, **kwargs):
+        return _HashingStream(super()._get_file_stream(*args, **kwargs))
+
 
 app = Flask(__name__)
+app.request_class = _UploadRequest
 CORS(app)  # allow dev server (Vite) to call the API
 app.config["MAX_CONTENT_LENGTH"] = MAX_CONTENT_LENGTH
 
-# Memory cache for downloadable reports (replace with Redis/S3 in prod)
-REPORT_CACHE: dict[str, bytes] = {}
+
+class ReportCache:
+    # In-memory report store bounded by a byte budget; entries expire after their ttl (default
+    # from the constructor) and the least recently used ones are evicted first when over budget.
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, Tuple[float, int, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() > entry[0]:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: str, data: Any, ttl: float | None = None, nbytes: int | None = None):
+        # nbytes defaults to len(data), which is right for report blobs
+        nbytes = len(data) if nbytes is None else nbytes
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if nbytes > self.max_bytes:
+                self.evictions += 1  # would never fit; reported as expired on download
+                return
+            deadline = time.monotonic() + (self.ttl if ttl is None else ttl)
+            self._entries[key] = (deadline, nbytes, data)
+            self.size += nbytes
+            self._expire()
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _expire(self):
+        now = time.monotonic()
+        # LRU order is not expiry order, so scan; the cache holds few, large entries
+        for key in [k for k, (deadline, _, _) in self._entries.items() if now > deadline]:
+            self._drop(key)
+            self.expirations += 1
+
+    def _drop(self, key: str):
+        _, nbytes, _ = self._entries.pop(key)
+        self.size -= nbytes
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.monotonic() <= entry[0]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class SqliteCache:
+    # ReportCache's interface over a SQLite table, so every process using the same file sees
+    # the same entries. Values are pickled; deadlines are wall-clock so they mean the same in
+    # every process. Hit/miss counters are per process.
+
+    def __init__(self, path: str, table: str, max_bytes: int, ttl: float):
+        self.path = path
+        self.table = table
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._db().execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, deadline REAL NOT NULL,"
+            " used REAL NOT NULL, nbytes INTEGER NOT NULL, value BLOB NOT NULL)")
+
+    def _db(self) -> sqlite3.Connection:
+        # One connection per thread, reopened after a fork (gunicorn --preload, job pool)
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def get(self, key: str) -> Any:
+        db = self._db()
+        now = time.time()
+        row = db.execute(f"SELECT deadline, value FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        if row is not None and now > row[0]:
+            db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self.expirations += 1
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        db.execute(f"UPDATE {self.table} SET used = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return pickle.loads(row[1])
+
+    def put(self, key: str, data: Any, ttl: float | None = None, nbytes: int | None = None):
+        # Budgeted by the pickled size, whatever nbytes the caller estimated
+        blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            self.evictions += 1
+            return
+        now = time.time()
+        deadline = now + (self.ttl if ttl is None else ttl)
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute(f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?, ?)",
+                       (key, deadline, now, len(blob), blob))
+            self.expirations += db.execute(
+                f"DELETE FROM {self.table} WHERE deadline < ?", (now,)).rowcount
+            size = db.execute(f"SELECT COALESCE(SUM(nbytes), 0) FROM {self.table}").fetchone()[0]
+            if size > self.max_bytes:
+                for old, old_bytes in db.execute(
+                        f"SELECT key, nbytes FROM {self.table} WHERE key != ? ORDER BY used",
+                        (key,)).fetchall():
+                    db.execute(f"DELETE FROM {self.table} WHERE key = ?", (old,))
+                    self.evictions += 1
+                    size -= old_bytes
+                    if size <= self.max_bytes:
+                        break
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def __contains__(self, key: str) -> bool:
+        row = self._db().execute(
+            f"SELECT 1 FROM {self.table} WHERE key = ? AND deadline >= ?", (key, time.time())).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self._db().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def stats(self) -> dict:
+        entries, size = self._db().execute(
+            f"SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM {self.table}").fetchone()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def _result_cache(table: str, max_bytes: int):
+    if RESULT_STORE == "sqlite":
+        return SqliteCache(RESULT_STORE_PATH, table, max_bytes, REPORT_CACHE_TTL)
+    if RESULT_STORE != "memory":
+        raise ValueError(f"RESULT_STORE must be memory or sqlite, not {RESULT_STORE!r}")
+    return ReportCache(max_bytes, REPORT_CACHE_TTL)
+
+
+class ReportStore:
+    # Rendered reports as files under a directory, so downloads are served straight from disk.
+    # Files are written to a temp name and renamed into place; past the byte budget the least
+    # recently used are deleted (a hit sets the file's atime), and files older than ttl count
+    # as expired.
+
+    def __init__(self, directory: str, max_bytes: int, ttl: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str | None:
+        # Report keys are timestamps; anything else never maps to a file
+        if not key.isdigit():
+            return None
+        return os.path.join(self.directory, key + ".xlsx")
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            mtime = os.stat(path).st_mtime if path else None
+        except FileNotFoundError:
+            mtime = None
+        now = time.time()
+        with self._lock:
+            if mtime is not None and now > mtime + self.ttl:
+                self._remove(path)
+                self.expirations += 1
+                mtime = None
+            if mtime is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            try:
+                os.utime(path, (now, mtime))  # mtime stays: it drives the TTL and the ETag
+            except OSError:
+                pass
+        return path
+
+    def put(self, key: str, write: Callable[[Any], None]) -> str | None:
+        path = self._path(key)
+        if path is None:
+            return None
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".xlsx", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                write(fh)
+            os.replace(tmp, path)
+        except BaseException:
+            self._remove(tmp)
+            raise
+        with self._lock:
+            self._cleanup(keep=path)
+        return path
+
+    def _files(self) -> List[Tuple[str, os.stat_result]]:
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".xlsx") and not entry.name.startswith("."):
+                try:
+                    files.append((entry.path, entry.stat()))
+                except FileNotFoundError:
+                    pass
+        return files
+
+    def _cleanup(self, keep: str):
+        now = time.time()
+        files = []
+        for path, st in self._files():
+            if now > st.st_mtime + self.ttl:
+                self._remove(path)
+                self.expirations += 1
+            else:
+                files.append((st.st_atime, st.st_size, path))
+        size = sum(nbytes for _, nbytes, _ in files)
+        for _, nbytes, path in sorted(files):
+            if size <= self.max_bytes:
+                break
+            if path != keep:
+                self._remove(path)
+                self.evictions += 1
+                size -= nbytes
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def __contains__(self, key: str) -> bool:
+        path = self._path(key)
+        return path is not None and os.path.exists(path)
+
+    def stats(self) -> dict:
+        files = self._files()
+        with self._lock:
+            return {
+                "entries": len(files),
+                "bytes": sum(st.st_size for _, st in files),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# Downloadable reports on disk (replace with Redis/S3 in prod)
+REPORT_STORE = ReportStore(REPORT_DIR, REPORT_CACHE_MAX_BYTES, REPORT_CACHE_TTL)
+# Aggregate state (_StreamingSummary) behind each report key; workbooks and deltas build on it
+SUMMARY_CACHE = _result_cache("summaries", SUMMARY_CACHE_MAX_BYTES)
+# Content-addressed memo of upload responses: content key -> (report_key, JSON body)
+UPLOAD_CACHE = _result_cache("uploads", UPLOAD_CACHE_MAX_BYTES)
+# Formatted client summary + lowercase search index per report, for paged table queries
+TABLE_CACHE = ReportCache(TABLE_CACHE_MAX_BYTES, REPORT_CACHE_TTL)
+
+# Async upload jobs (?async=1): parsed in a bounded process pool, polled via /api/jobs/<id>.
+# _JOBS holds the futures of this process's jobs; JOB_STORE publishes their state and result
+# bodies so any worker sharing the result store can answer for them.
+JOB_STORE = _result_cache("jobs", UPLOAD_CACHE_MAX_BYTES)
+_JOBS: dict[str, dict] = {}
+_JOBS_LOCK = threading.Lock()
+_JOB_POOL: ProcessPoolExecutor | None = None
+_JOB_POOL_LOCK = threading.Lock()
+_JOB_PROGRESS = None
+
+
+class _Histogram:
+    # Prometheus histogram with fixed buckets, one series per label combination
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...], labels: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = labels
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, (counts, total, count) in sorted(self._series.items()):
+                labels = ",".join(f'{k}="{v}"' for k, v in zip(self.labels, label_values))
+                sep = "," if labels else ""
+                for bound, n in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{{{labels}{sep}le="{bound:g}"}} {n}')
+                lines.append(f'{self.name}_bucket{{{labels}{sep}le="+Inf"}} {count}')
+                lines.append(f"{self.name}_sum{{{labels}}} {total:.6f}")
+                lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return lines
+
+
+_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+_BYTES = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9)
+_METRICS = {
+    "request": _Histogram("summarizer_request_seconds", "Wall time of API requests.",
+                          _SECONDS, ("endpoint", "status")),
+    "phase": _Histogram("summarizer_phase_seconds", "Wall time per request phase.",
+                        _SECONDS, ("endpoint", "phase")),
+    "rows": _Histogram("summarizer_rows", "Rows read per upload.",
+                       (1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7), ("endpoint",)),
+    "columns": _Histogram("summarizer_columns", "Columns read per upload.",
+                          (5, 10, 20, 50, 100, 200, 500), ("endpoint",)),
+    "output": _Histogram("summarizer_output_bytes", "Response body size.", _BYTES, ("endpoint",)),
+    "memory": _Histogram("summarizer_phase_memory_bytes", "tracemalloc peak growth per phase.",
+                         _BYTES, ("endpoint", "phase")),
+    "admission_wait": _Histogram("summarizer_admission_wait_seconds",
+                                 "Time uploads waited for admission.", _SECONDS, ("endpoint",)),
+}
+if METRICS_TRACEMALLOC:
+    tracemalloc.start()
+
+
+class _Admission:
+    # Memory-budget semaphore: a request waits (bounded queue, bounded time) until it fits both
+    # the concurrency limit and the byte budget. A request larger than the whole budget still
+    # runs, but only alone.
+
+    def __init__(self, budget: int, max_active: int, max_queue: int, timeout: float):
+        self.budget = budget
+        self.max_active = max_active
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self.active = 0
+        self.in_use = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def _fits(self, cost: int) -> bool:
+        if self.active == 0:
+            return True
+        return self.active < self.max_active and self.in_use + cost <= self.budget
+
+    def acquire(self, cost: int) -> bool:
+        with self._cond:
+            if not self._fits(cost):
+                if self.waiting >= self.max_queue:
+                    self.rejected += 1
+                    return False
+                self.waiting += 1
+                try:
+                    admitted = self._cond.wait_for(lambda: self._fits(cost), self.timeout)
+                finally:
+                    self.waiting -= 1
+                if not admitted:
+                    self.rejected += 1
+                    return False
+            self.active += 1
+            self.in_use += cost
+            self.admitted += 1
+            return True
+
+    def release(self, cost: int):
+        with self._cond:
+            self.active -= 1
+            self.in_use -= cost
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"active": self.active, "in_use_bytes": self.in_use, "budget_bytes": self.budget,
+                    "queue_depth": self.waiting, "admitted": self.admitted, "rejected": self.rejected}
+
+
+ADMISSION = _Admission(ADMISSION_MEMORY_BYTES, ADMISSION_MAX_ACTIVE, ADMISSION_MAX_QUEUE,
+                       ADMISSION_QUEUE_TIMEOUT)
+
+
+class _Phases:
+    # Per-request phase timings (accumulated when a phase repeats, e.g. once per chunk)
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seconds: OrderedDict[str, float] = OrderedDict()
+        self.memory: dict[str, int] = {}
+        self.rows: int | None = None
+        self.columns: int | None = None
+        self.output_bytes: int | None = None
+
+    @contextmanager
+    def phase(self, name: str):
+        if METRICS_TRACEMALLOC:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+            if METRICS_TRACEMALLOC:
+                grown = tracemalloc.get_traced_memory()[1] - base
+                self.memory[name] = max(self.memory.get(name, 0), grown)
+
+
+def _phases() -> _Phases | None:
+    # Only API requests are instrumented; pool workers and callbacks have no request
+    return g.get("phases") if has_request_context() else None
+
+
+def _phase(name: str):
+    phases = _phases()
+    return phases.phase(name) if phases is not None else nullcontext()
 
 # HTML template for the frontend
 HTML_TEMPLATE = """
@@ -624,6 +1423,11 @@ HTML_TEMPLATE = """
 </html>
 """
 
+# The page has no template variables: encode and compress it once at import
+_UI_BODY = HTML_TEMPLATE.encode("utf-8")
+_UI_GZIP = gzip.compress(_UI_BODY, compresslevel=9, mtime=0)
+_UI_ETAG = hashlib.sha256(_UI_BODY).hexdigest()[:16]
+
 
 def _ext_ok(filename: str) -> bool:
     return os.path.splitext(filename)[1].lower() in ALLOWED_EXTS
@@ -635,108 +1439,544 @@ def _read_upload(file_storage) -> pd.DataFrame:
     if ext not in ALLOWED_EXTS:
         raise ValueError(f"Unsupported file type: {ext}")
 
-    if ext == ".csv":
-        chunks: List[pd.DataFrame] = []
-        for chunk in pd.read_csv(file_storage, chunksize=100_000, low_memory=False):
-            chunks.append(chunk)
-        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
-    else:
-        df = pd.read_excel(file_storage, sheet_name=0)  # first sheet
-
+    chunks: List[pd.DataFrame] = list(_iter_upload(file_storage))
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
     df.columns = [str(c).strip() for c in df.columns]
     return df
 
 
+def _iter_csv(file_storage, usecols=None, dtype=None, nrows=None) -> Iterator[pd.DataFrame]:
+    chunksize = min(CSV_CHUNKSIZE, nrows) if nrows else CSV_CHUNKSIZE
+    for chunk in pd.read_csv(file_storage, chunksize=chunksize, low_memory=False,
+                             usecols=usecols, dtype=dtype, nrows=nrows):
+        chunk.columns = [str(c).strip() for c in chunk.columns]
+        for i, t in enumerate(chunk.dtypes):
+            if isinstance(t, pd.CategoricalDtype):
+                chunk.isetitem(i, _inferred_labels(chunk.iloc[:, i]))
+        yield chunk
+
+
+def _inferred_labels(s: pd.Series) -> pd.Series:
+    # A category column keeps each field's raw text, but the keys are str() of what read_csv
+    # infers for the chunk: "1", "01" and "1.0" are all 1 (1.0 when the chunk has blanks).
+    # The distinct values are re-parsed the same way and relabelled through the codes.
+    cats = s.cat.categories
+    if len(cats) == 0:
+        return s
+    text = pd.Series(cats, dtype=object).to_csv(index=False, header=False)
+    parsed = pd.read_csv(io.StringIO(text), header=None, na_filter=False,
+                         skip_blank_lines=False).iloc[:, 0]
+    if len(parsed) != len(cats) or parsed.dtype == object:
+        return s
+    codes = s.cat.codes.to_numpy()
+    if (codes < 0).any() and parsed.dtype.kind in "iub":
+        parsed = parsed.astype(object if parsed.dtype.kind == "b" else float)
+    relabel, labels = pd.factorize(parsed.astype(str).to_numpy(dtype=object))
+    codes = np.where(codes < 0, -1, relabel.take(codes))
+    return pd.Series(pd.Categorical.from_codes(codes, labels), index=s.index, name=s.name)
+
+
+def _iter_xlsx(file_storage, sheet: int = 0) -> Iterator[pd.DataFrame]:
+    # Stream the sheet's XML and pick out only the summary columns; workbooks the fast
+    # reader does not understand go through openpyxl's read-only mode instead.
+    try:
+        reader = _XlsxReader(file_storage, sheet)
+        rows = reader.rows()
+        header = reader.header(next(rows, None))
+    except (_XlsxUnsupported, KeyError, ET.ParseError):
+        file_storage.seek(0)
+        yield from _iter_xlsx_openpyxl(file_storage, sheet)
+        return
+
+    if header is None:
+        return
+    positions, names = _xlsx_columns(header)
+    if not positions:
+        # Let _require_columns report what is missing
+        yield pd.DataFrame(columns=[str(c).strip() for c in header if c is not None])
+        return
+
+    from openpyxl.utils import get_column_letter
+
+    letters = [get_column_letter(i + 1).encode() for i in positions]
+    slot = dict(zip(letters, range(len(letters))))
+    cell_re = reader.cell_re(letters)
+    batch: list = []
+    emitted = False
+    for row in rows:
+        record = [None] * len(letters)
+        for letter, attrs, inner in cell_re.findall(row):
+            record[slot[letter]] = reader.value(attrs, inner)
+        batch.append(record)
+        if len(batch) >= XLSX_BATCH_ROWS:
+            yield _xlsx_frame(batch, names)
+            batch, emitted = [], True
+    if batch or not emitted:
+        yield _xlsx_frame(batch, names)
+
+
+def _iter_xlsx_openpyxl(file_storage, sheet: int = 0) -> Iterator[pd.DataFrame]:
+    # Row-iterating read-only reader: resolve the header, keep only the summary columns and
+    # hand them on in XLSX_BATCH_ROWS batches, so memory follows the batch, not the sheet.
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_storage, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[sheet].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        positions, names = _xlsx_columns(header)
+        if not positions:
+            # Let _require_columns report what is missing
+            yield pd.DataFrame(columns=[str(c).strip() for c in header if c is not None])
+            return
+
+        width = len(header)
+        batch: list = []
+        emitted = False
+        for row in rows:
+            if row.count(None) == len(row):
+                continue  # blank line, skipped like read_excel does
+            if len(row) < width:
+                row = row + (None,) * (width - len(row))
+            batch.append([row[i] for i in positions])
+            if len(batch) >= XLSX_BATCH_ROWS:
+                yield _xlsx_frame(batch, names)
+                batch, emitted = [], True
+        if batch or not emitted:
+            yield _xlsx_frame(batch, names)
+    finally:
+        wb.close()
+
+
+class _XlsxUnsupported(Exception):
+    pass
+
+
+_XLSX_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_XLSX_DOC_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_XLSX_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_XLSX_ANY_CELL_RE = re.compile(rb'<c\b(?=[^>]*?\sr="([A-Z]+)\d+")([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+_XLSX_UNREFERENCED_CELL_RE = re.compile(rb'<c(?=[\s/>])(?![^>]*\sr=")')
+_XLSX_TYPE_RE = re.compile(rb'\st="([^"]*)"')
+_XLSX_STYLE_RE = re.compile(rb'\ss="(\d+)"')
+_XLSX_VALUE_RE = re.compile(rb"<v>(.*?)</v>", re.S)
+_XLSX_TEXT_RE = re.compile(rb"<t(?:\s[^>]*)?>(.*?)</t>", re.S)
+_XLSX_PHONETIC_RE = re.compile(rb"<rPh\b.*?</rPh>", re.S)
+
+
+def _xml_text(raw: bytes) -> str:
+    text = raw.decode("utf-8")
+    return html.unescape(text) if "&" in text else text
+
+
+class _XlsxReader:
+    # Minimal SpreadsheetML reader for one worksheet. Mirrors what openpyxl + pandas hand
+    # back per cell (shared/inline strings, numbers, bools, dates) without building cell
+    # objects for columns nobody reads.
+
+    def __init__(self, file_storage, sheet: int = 0):
+        self.zip = zipfile.ZipFile(file_storage)
+        workbook_path = self._office_document()
+        workbook = ET.fromstring(self.zip.read(workbook_path))
+        if workbook.tag != _XLSX_MAIN_NS + "workbook":
+            raise _XlsxUnsupported(workbook.tag)
+
+        self.targets = self._relationships(workbook_path)
+        self.sheets = [
+            (el.get("name"), self.targets[el.get(_XLSX_DOC_REL_NS + "id")][1])
+            for el in workbook.iterfind(f"{_XLSX_MAIN_NS}sheets/{_XLSX_MAIN_NS}sheet")
+        ]
+        if not self.sheets:
+            raise _XlsxUnsupported("workbook has no sheets")
+        self.sheet_path = self.sheets[sheet][1]
+
+        props = workbook.find(_XLSX_MAIN_NS + "workbookPr")
+        date1904 = props is not None and props.get("date1904") in ("1", "true")
+        from openpyxl.utils.datetime import MAC_EPOCH, WINDOWS_EPOCH
+        self.epoch = MAC_EPOCH if date1904 else WINDOWS_EPOCH
+        self.shared: List[str] | None = None
+
+    def _load_cell_parts(self):
+        # String table and date styles are only needed once rows are actually read
+        paths = {kind: path for kind, path in self.targets.values()}
+        self.shared = self._shared_strings(paths.get("sharedStrings"))
+        self.date_styles, self.timedelta_styles = self._date_styles(paths.get("styles"))
+
+    def _office_document(self) -> str:
+        for rel in ET.fromstring(self.zip.read("_rels/.rels")):
+            if rel.get("Type", "").endswith("/officeDocument"):
+                return rel.get("Target").lstrip("/")
+        raise _XlsxUnsupported("no officeDocument relationship")
+
+    def _relationships(self, part: str) -> dict:
+        base, name = posixpath.split(part)
+        rels = ET.fromstring(self.zip.read(posixpath.join(base, "_rels", name + ".rels")))
+        targets = {}
+        for rel in rels.iter(_XLSX_PKG_REL_NS + "Relationship"):
+            target = rel.get("Target", "")
+            path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(
+                posixpath.join(base, target))
+            targets[rel.get("Id")] = (rel.get("Type", "").rsplit("/", 1)[-1], path)
+        return targets
+
+    def _shared_strings(self, path: str | None) -> List[str]:
+        if path is None:
+            return []
+        strings: List[str] = []
+        with self.zip.open(path) as fh:
+            for _, el in ET.iterparse(fh):
+                if el.tag != _XLSX_MAIN_NS + "si":
+                    continue
+                plain = el.find(_XLSX_MAIN_NS + "t")
+                if plain is not None:
+                    strings.append(plain.text or "")
+                else:  # rich text runs; phonetic (rPh) runs are not part of the value
+                    runs = el.iterfind(f"{_XLSX_MAIN_NS}r/{_XLSX_MAIN_NS}t")
+                    strings.append("".join(t.text or "" for t in runs))
+                el.clear()
+        return strings
+
+    def _date_styles(self, path: str | None) -> Tuple[set, set]:
+        if path is None:
+            return set(), set()
+        from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+
+        styles = ET.fromstring(self.zip.read(path))
+        custom = {
+            int(fmt.get("numFmtId")): fmt.get("formatCode", "")
+            for fmt in styles.iterfind(f"{_XLSX_MAIN_NS}numFmts/{_XLSX_MAIN_NS}numFmt")
+        }
+        dates, deltas = set(), set()
+        for i, xf in enumerate(styles.iterfind(f"{_XLSX_MAIN_NS}cellXfs/{_XLSX_MAIN_NS}xf")):
+            fmt_id = int(xf.get("numFmtId", 0))
+            fmt = custom.get(fmt_id) or BUILTIN_FORMATS.get(fmt_id)
+            if fmt and is_date_format(fmt):
+                dates.add(i)
+                if is_timedelta_format(fmt):
+                    deltas.add(i)
+        return dates, deltas
+
+    def rows(self) -> Iterator[bytes]:
+        # Inner XML of every non-blank <row>, read from the zip member in fixed-size blocks
+        if self.shared is None:
+            self._load_cell_parts()
+        with self.zip.open(self.sheet_path) as fh:
+            buf = fh.read(XLSX_XML_BLOCK)
+            if b"<worksheet" not in buf[:4096]:
+                raise _XlsxUnsupported("prefixed or non-UTF-8 worksheet")
+            if _XLSX_UNREFERENCED_CELL_RE.search(buf):
+                raise _XlsxUnsupported("cells without references")
+            # Every writer we know of puts r= first, which allows a much cheaper cell pattern
+            self.refs_first = buf.count(b"<c ") == buf.count(b'<c r="')
+            while True:
+                block = fh.read(XLSX_XML_BLOCK)
+                *rows, buf = (buf + block).split(b"</row>")
+                for row in rows:
+                    start = row.rfind(b"<row")
+                    row = row[row.find(b">", start) + 1:]
+                    if b"<v>" in row or b"<is>" in row:
+                        yield row
+                if not block:
+                    return
+
+    def cell_re(self, letters: List[bytes]) -> re.Pattern:
+        # Only cells referencing one of the wanted columns; everything else is skipped in C
+        alternatives = b"|".join(re.escape(letter) for letter in letters)
+        if self.refs_first:
+            head = rb'<c r="(' + alternatives + rb')\d+"'
+        else:
+            head = rb'<c\b(?=[^>]*?\sr="(' + alternatives + rb')\d+")'
+        return re.compile(head + rb"([^>]*?)(?:/>|>(.*?)</c>)", re.S)
+
+    def header(self, row: bytes | None) -> tuple | None:
+        if row is None:
+            return None
+        from openpyxl.utils import column_index_from_string
+
+        cells = {
+            column_index_from_string(letter.decode()) - 1: self.value(attrs, inner)
+            for letter, attrs, inner in _XLSX_ANY_CELL_RE.findall(row)
+        }
+        width = max(cells) + 1 if cells else 0
+        return tuple(cells.get(i) for i in range(width))
+
+    def value(self, attrs: bytes, inner: bytes):
+        kind = _XLSX_TYPE_RE.search(attrs)
+        kind = kind.group(1) if kind else b"n"
+        if kind == b"inlineStr":
+            if b"<rPh" in inner:
+                inner = _XLSX_PHONETIC_RE.sub(b"", inner)
+            return _xml_text(b"".join(_XLSX_TEXT_RE.findall(inner))) or None
+
+        match = _XLSX_VALUE_RE.search(inner)
+        raw = match.group(1) if match else b""
+        if not raw:
+            return None
+        if kind == b"n":
+            return self._number(attrs, raw)
+        if kind == b"s":
+            return self.shared[int(raw)] or None
+        if kind == b"b":
+            return bool(int(raw))
+        if kind == b"e":
+            return np.nan  # pandas turns error cells into NaN
+        if kind == b"d":
+            from openpyxl.utils.datetime import from_ISO8601
+            return from_ISO8601(raw.decode())
+        return _xml_text(raw) or None
+
+    def _number(self, attrs: bytes, raw: bytes):
+        if b"." in raw or b"E" in raw or b"e" in raw:
+            value = float(raw)
+            if value.is_integer():
+                value = int(value)
+        else:
+            value = int(raw)
+        if self.date_styles:
+            style = _XLSX_STYLE_RE.search(attrs)
+            style_id = int(style.group(1)) if style else 0
+            if style_id in self.date_styles:
+                from openpyxl.utils.datetime import from_excel
+                try:
+                    return from_excel(value, self.epoch,
+                                      timedelta=style_id in self.timedelta_styles)
+                except (OverflowError, ValueError):
+                    return np.nan
+        return value
+
+
+def _xlsx_columns(header: tuple) -> Tuple[List[int], List[str]]:
+    # Like _project: the summary columns, plus the first one when the pivot engine counts on it
+    cells = ["" if cell is None else cell for cell in header]
+    wanted = set(REQUIRED_COLUMNS + OPTIONAL_ATTRS)
+    keep_first = SUMMARY_ENGINE == "pivot"
+    resolved = RULES.resolve(cells)
+    positions = [i for i in range(len(cells))
+                 if (i == 0 and keep_first) or resolved.get(i) in wanted]
+    return positions, [str(cells[i]).strip() for i in positions]
+
+
+def _xlsx_frame(batch: list, names: List[str]) -> pd.DataFrame:
+    # Object columns keep cell values as typed by openpyxl; empty cells become NaN, not None
+    df = pd.DataFrame(batch, columns=names, dtype=object)
+    return df.where(df.notna(), np.nan)
+
+
+def _iter_upload(file_storage, sheet: int = 0, nrows: int | None = None) -> Iterator[pd.DataFrame]:
+    # sheet is the workbook position (first sheet by default); CSVs have just the one. nrows
+    # stops reading after that many rows.
+    name = file_storage.filename or "uploaded"
+    ext = os.path.splitext(name)[1].lower()
+    if ext == ".csv":
+        usecols, dtype = _project(_sniff_header(file_storage))
+        yield from _iter_csv(file_storage, usecols, dtype, nrows)
+    elif ext == ".xlsx":
+        for batch in _iter_xlsx(file_storage, sheet):
+            if nrows is not None:
+                batch = batch.iloc[:nrows]
+                nrows -= len(batch)
+            yield batch
+            if nrows == 0:
+                break
+    else:
+        df = pd.read_excel(file_storage, sheet_name=sheet, nrows=nrows)
+        df.columns = [str(c).strip() for c in df.columns]
+        yield df
+
+
+def _sheet_names(file_storage) -> List[str | None]:
+    # Every sheet of a workbook, in workbook order; [None] for CSV
+    ext = os.path.splitext(file_storage.filename or "")[1].lower()
+    try:
+        if ext == ".csv":
+            return [None]
+        if ext == ".xlsx":
+            try:
+                return [name for name, _ in _XlsxReader(file_storage).sheets]
+            except (_XlsxUnsupported, KeyError, ET.ParseError):
+                from openpyxl import load_workbook
+                file_storage.seek(0)
+                wb = load_workbook(file_storage, read_only=True)
+                try:
+                    return list(wb.sheetnames)
+                finally:
+                    wb.close()
+        return list(pd.ExcelFile(file_storage).sheet_names)
+    finally:
+        file_storage.seek(0)
+
+
+def _sniff_header(file_storage) -> list | None:
+    # Raw CSV header row only, so the real read can be projected; rewinds the upload afterwards
+    # (a streamed upload is peeked instead)
+    stream = file_storage.stream
+    try:
+        if isinstance(stream, _MultipartUpload):
+            head = stream.head()
+            return None if head is None else list(pd.read_csv(io.BytesIO(head), nrows=0).columns)
+        return list(pd.read_csv(file_storage, nrows=0).columns)
+    except (ValueError, OSError):
+        return None
+    finally:
+        if not isinstance(stream, _MultipartUpload):
+            file_storage.seek(0)
+
+
+def _check_header(file_storage):
+    # Reject a CSV whose header row lacks the summary columns before the rest is read
+    if os.path.splitext(file_storage.filename or "")[1].lower() != ".csv":
+        return
+    header = _sniff_header(file_storage)
+    if header is not None:
+        _require_columns(pd.DataFrame(columns=sorted(set(RULES.resolve(header).values()))),
+                         REQUIRED_COLUMNS)
+
+
+def _project(header: list | None) -> Tuple[list | None, dict | None]:
+    # Positions of the columns _summaries reads (plus the first one when the pivot engine
+    # counts on it); required text columns are parsed straight into category dtype and
+    # relabelled by _inferred_labels.
+    if not header:
+        return None, None
+    wanted = set(REQUIRED_COLUMNS + OPTIONAL_ATTRS)
+    keep_first = SUMMARY_ENGINE == "pivot"
+    resolved = {i: name for i, name in RULES.resolve(header).items() if name in wanted}
+    usecols = [i for i in range(len(header)) if (i == 0 and keep_first) or i in resolved]
+    dtype = {header[i]: "category" for i in usecols if resolved.get(i) in REQUIRED_COLUMNS}
+    return usecols, dtype
+
+
+class _SchemaError(ValueError):
+    pass
+
+
 def _require_columns(df: pd.DataFrame, required: List[str]):
     missing = [c for c in required if c not in df.columns]
     if missing:
-        raise ValueError(
+        raise _SchemaError(
             "Missing required columns: " + ", ".join(missing) +
             " — expected at least: Zone, Client Name, Order Status"
         )
 
 
 def _normalize(df: pd.DataFrame) -> pd.DataFrame:
-    return df.rename(columns={
-        "zone": "Zone",
-        "client": "Client Name",
-        "client_name": "Client Name",
-        "order_status": "Order Status",
-        "status": "Order Status",
-        "state": "State",
-        "State": "State",
-        "tier": "Tier",
-        "Tier": "Tier",
-    })
+    resolved = RULES.resolve(list(df.columns))
+    if not resolved:
+        return df
+    out = df.copy(deep=False)
+    out.columns = [resolved.get(i, col) for i, col in enumerate(df.columns)]
+    return out
+
+
+def _map_unique(s: pd.Series, fn: Callable[[str], str]) -> pd.Series:
+    # Apply fn to each distinct string once and broadcast back through the codes; for category
+    # columns the categories are the distinct values, otherwise factorize the str() values
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        labels = np.append(s.cat.categories.astype(str).to_numpy(dtype=object), "nan")
+        codes = s.cat.codes.to_numpy()
+    else:
+        codes, labels = pd.factorize(s.astype(str).to_numpy(dtype=object), use_na_sentinel=False)
+    labels = np.array([fn(v) for v in labels], dtype=object)
+    return pd.Series(labels.take(codes), index=s.index, dtype=object)
+
+
+def _as_str(s: pd.Series) -> pd.Series:
+    return _map_unique(s, str.strip)
 
 
 def _coerce(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    for col in ["Zone", "Client Name", "Order Status"]:
+    out = df.copy(deep=False)
+    for col in REQUIRED_COLUMNS:
         if col in out.columns:
-            out[col] = out[col].astype(str).str.strip()
+            out[col] = _as_str(out[col])
     return out
 
 
-def _summaries(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
     df = _normalize(df)
-    _require_columns(df, ["Zone", "Client Name", "Order Status"])
+    _require_columns(df, REQUIRED_COLUMNS)
     df = _coerce(df)
+    df["Order Status"] = _map_unique(df["Order Status"], RULES.status)
+    return df
 
-    status_map = {
-        "cancelled": "Cancelled",
-        "canceled": "Cancelled",
-        "complete": "Completed",
-        "completed": "Completed",
-        "hold": "HOLD",
-        "pending": "Pending",
-    }
-    s = df["Order Status"].str.lower().str.strip().map(status_map).fillna(df["Order Status"])
-    df["Order Status"] = s
 
-    # Pivot: Zone × Client × Status (counts)
-    pivot = pd.pivot_table(
-        df,
-        index=["Zone", "Client Name"],
-        columns=["Order Status"],
-        values=df.columns[0],  # any column to count
-        aggfunc="count",
-        fill_value=0,
+def _meta(df: pd.DataFrame) -> pd.DataFrame | None:
+    # Bring "first" attributes (State, Tier by default) back alongside the grouped keys if present
+    optional_attrs = [attr for attr, reducers in RULES.attributes.items()
+                      if "first" in reducers and attr in df.columns]
+    if not optional_attrs:
+        return None
+
+    # Build client-level meta (first non-null value) for each (Zone, Client Name); groupby.first
+    # skips nulls per column in one vectorized pass
+    return (
+        df.dropna(subset=optional_attrs, how="all")
+          .groupby(KEY_COLUMNS, as_index=False)[optional_attrs]
+          .first()
     )
 
-    for col in ["Cancelled", "Completed", "HOLD", "Pending"]:
+
+def _attr_counts(df: pd.DataFrame) -> dict:
+    # (Zone, Client Name, value) row counts for attributes with mode/distinct/conflict reducers;
+    # unlike the reduced values these merge across chunks by simple addition
+    counts = {}
+    for attr, reducers in RULES.attributes.items():
+        if attr in df.columns and set(reducers) - {"first"}:
+            counts[attr] = df.groupby(KEY_COLUMNS + [attr], sort=False).size()
+    return counts
+
+
+def _attr_columns() -> List[str]:
+    # Output column per configured reducer: "first" keeps the attribute's name
+    return [attr if reducer == "first" else f"{attr} ({reducer})"
+            for attr, reducers in RULES.attributes.items() for reducer in reducers]
+
+
+def _client_meta(meta: pd.DataFrame | None, attr_counts: dict,
+                 index: pd.MultiIndex) -> pd.DataFrame | None:
+    # Reduce the attribute counts for every client in index and join them onto the first values
+    extra = {}
+    for attr, counts in attr_counts.items():
+        reducers = RULES.attributes[attr]
+        keys = counts.index.droplevel(attr)
+        if "mode" in reducers:
+            # Most frequent value; ties go to the value seen first (stable sort)
+            order = np.argsort(-counts.to_numpy(), kind="stable")
+            first = ~keys.take(order).duplicated()
+            extra[f"{attr} (mode)"] = pd.Series(
+                counts.index.get_level_values(attr).take(order)[first], index=keys.take(order)[first]
+            ).reindex(index)
+        distinct = counts.groupby(level=KEY_COLUMNS, sort=False).size().reindex(index, fill_value=0)
+        if "distinct" in reducers:
+            extra[f"{attr} (distinct)"] = distinct.astype("int64")
+        if "conflict" in reducers:
+            extra[f"{attr} (conflict)"] = distinct > 1
+    if not extra:
+        return meta
+    extra = pd.DataFrame(extra, index=index).rename_axis(KEY_COLUMNS).reset_index()
+    return extra if meta is None else meta.merge(extra, on=KEY_COLUMNS, how="outer")
+
+
+def _finish(pivot: pd.DataFrame, meta: pd.DataFrame | None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    for col in STATUS_COLUMNS:
         if col not in pivot.columns:
             pivot[col] = 0
 
-    pivot["Grand Total"] = pivot[["Cancelled", "Completed", "HOLD", "Pending"]].sum(axis=1)
+    pivot["Grand Total"] = pivot[STATUS_COLUMNS].sum(axis=1)
     pivot["Completion%"] = (pivot["Completed"] / pivot["Grand Total"]).fillna(0.0)
 
-    # Bring optional attributes (State, Tier) back alongside the grouped keys if present
-    optional_attrs: list[str] = []
-    for attr in ["State", "Tier"]:
-        if attr in df.columns:
-            optional_attrs.append(attr)
-
-    # Build client-level meta (first non-null value) for each (Zone, Client Name)
-    meta = None
-    if optional_attrs:
-        meta = (
-            df.dropna(subset=optional_attrs, how="all")
-              .groupby(["Zone", "Client Name"], as_index=False)[optional_attrs]
-              .agg(lambda s: s.dropna().iloc[0] if not s.dropna().empty else None)
-        )
-
     # Flatten pivot and optionally merge meta
     client_df = pivot.reset_index()
     if meta is not None:
-        client_df = client_df.merge(meta, on=["Zone", "Client Name"], how="left")
+        client_df = client_df.merge(meta, on=KEY_COLUMNS, how="left")
 
     # Enforce preferred display order when possible
     preferred_order = [
         "Zone",
         "Client Name",
-        "State",
-        "Tier",
+        *_attr_columns(),
         "Cancelled",
         "Completed",
         "HOLD",
@@ -759,15 +1999,926 @@ def _summaries(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
     return client_df, zone.reset_index()
 
 
-def _fmt_json(df: pd.DataFrame):
+def _pivot_table_counts(df: pd.DataFrame) -> pd.DataFrame:
+    # Legacy engine, kept for cross-checking: counts non-null values of the first column
+    return pd.pivot_table(
+        df,
+        index=KEY_COLUMNS,
+        columns=["Order Status"],
+        values=df.columns[0],  # any column to count
+        aggfunc="count",
+        fill_value=0,
+    )
+
+
+def _bincount_counts(df: pd.DataFrame) -> pd.DataFrame:
+    # Factorize the keys (sorted, like pivot_table), fold (Zone, Client) into one group code
+    # and count every row with a single bincount over group × status.
+    zone_codes, zones = pd.factorize(df["Zone"].to_numpy(), sort=True, use_na_sentinel=False)
+    client_codes, clients = pd.factorize(df["Client Name"].to_numpy(), sort=True, use_na_sentinel=False)
+    status_codes, statuses = pd.factorize(df["Order Status"].to_numpy(), sort=True, use_na_sentinel=False)
+
+    n_clients = max(len(clients), 1)
+    pair_codes = zone_codes.astype(np.int64) * n_clients + client_codes
+    group_codes, pairs = pd.factorize(pair_codes, sort=True)
+    n_groups, n_status = len(pairs), len(statuses)
+    counts = np.bincount(group_codes * n_status + status_codes, minlength=n_groups * n_status)
+
+    index = pd.MultiIndex.from_arrays(
+        [zones.take(pairs // n_clients), clients.take(pairs % n_clients)],
+        names=KEY_COLUMNS,
+    )
+    columns = pd.Index(statuses, name="Order Status")
+    return pd.DataFrame(counts.reshape(n_groups, n_status), index=index, columns=columns)
+
+
+def _count_pivot(df: pd.DataFrame) -> pd.DataFrame:
+    # Pivot: Zone × Client × Status (counts)
+    if SUMMARY_ENGINE == "pivot":
+        return _pivot_table_counts(df)
+    return _bincount_counts(df)
+
+
+def _cube_counts(df: pd.DataFrame) -> pd.Series:
+    # Row counts over every cube dimension; absent optional attributes count as missing
+    keys = pd.DataFrame({c: df[c] if c in df.columns else None for c in CUBE_DIMENSIONS},
+                        index=df.index)
+    return keys.groupby(CUBE_DIMENSIONS, dropna=False, sort=False).size()
+
+
+def _rollup(cube: pd.Series, by: List[str]) -> pd.DataFrame:
+    # Re-aggregate the cube to `by` × Order Status, with the zone summary's totals and
+    # Completion% plus a Grand Total row
+    counts = cube.groupby(level=by + ["Order Status"], dropna=False).sum()
+    pivot = counts.unstack("Order Status", fill_value=0).sort_index(axis=1)
+    for col in STATUS_COLUMNS:
+        if col not in pivot.columns:
+            pivot[col] = 0
+    pivot["Grand Total"] = pivot[STATUS_COLUMNS].sum(axis=1)
+    pivot["Completion%"] = (pivot["Completed"] / pivot["Grand Total"]).fillna(0.0)
+
+    out = pivot.reset_index()
+    out.columns.name = None
+    out[by] = out[by].astype(object).where(out[by].notna(), None)
+    total = out.drop(columns=by).sum(numeric_only=True)
+    total["Completion%"] = total["Completed"] / max(total["Grand Total"], 1)
+    grand = pd.DataFrame([{**{c: None for c in by}, by[0]: "Grand Total", **total}])
+    return pd.concat([out, grand[out.columns]], ignore_index=True)
+
+
+def _summaries(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    df = _prepare(df)
+    pivot = _count_pivot(df)
+    return _finish(pivot, _client_meta(_meta(df), _attr_counts(df), pivot.index))
+
+
+class _StreamingSummary:
+    # Mergeable partial aggregate: per-chunk (Zone, Client Name) × Order Status count pivots
+    # plus first-seen attributes and per-client attribute value counts. Memory grows with
+    # distinct clients (and their attribute values), not with rows.
+
+    def __init__(self):
+        self.pivot: pd.DataFrame | None = None
+        self.meta: pd.DataFrame | None = None
+        self.attr_counts: dict = {}
+        self.cube: pd.Series | None = None
+        self.rows = 0
+
+    def add(self, chunk: pd.DataFrame):
+        self.add_prepared(_prepare(chunk))
+
+    def add_prepared(self, df: pd.DataFrame):
+        meta = _meta(df)
+        self._fold(_count_pivot(df), meta.set_index(KEY_COLUMNS) if meta is not None else None,
+                   _cube_counts(df), _attr_counts(df))
+        self.rows += len(df)
+
+    def merge(self, other: "_StreamingSummary"):
+        self._fold(other.pivot, other.meta, other.cube, other.attr_counts)
+        self.rows += other.rows
+
+    def _fold(self, pivot: pd.DataFrame | None, meta: pd.DataFrame | None,
+              cube: pd.Series | None = None, attr_counts: dict | None = None):
+        for attr, counts in (attr_counts or {}).items():
+            if attr in self.attr_counts:
+                counts = (pd.concat([self.attr_counts[attr], counts])
+                            .groupby(level=KEY_COLUMNS + [attr], sort=False).sum())
+            self.attr_counts[attr] = counts
+        if cube is not None:
+            if self.cube is None:
+                self.cube = cube
+            else:
+                # groupby rather than Series.add: missing State/Tier are NaN keys in the index
+                self.cube = (pd.concat([self.cube, cube])
+                               .groupby(level=CUBE_DIMENSIONS, dropna=False, sort=False).sum())
+        if pivot is not None:
+            if self.pivot is None:
+                self.pivot = pivot
+            else:
+                self.pivot = self.pivot.add(pivot, fill_value=0).fillna(0).astype("int64")
+        if meta is None:
+            return
+        if self.meta is None:
+            self.meta = meta
+            return
+        # Earlier chunks win: only fill attributes still missing a value, then append new clients
+        other = meta.reindex(self.meta.index)
+        kept = self.meta.where(self.meta.notna() | other.isna(), other)
+        fresh = meta[~meta.index.isin(self.meta.index)]
+        self.meta = pd.concat([kept, fresh]) if len(fresh) else kept
+
+    def finish(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        if self.pivot is None:
+            _require_columns(pd.DataFrame(), REQUIRED_COLUMNS)
+        pivot = self.pivot.sort_index().sort_index(axis=1)
+        meta = self.meta.sort_index().reset_index() if self.meta is not None else None
+        return _finish(pivot, _client_meta(meta, self.attr_counts, pivot.index))
+
+    def rollup(self, by: List[str]) -> pd.DataFrame:
+        if self.cube is None:
+            _require_columns(pd.DataFrame(), REQUIRED_COLUMNS)
+        return _rollup(self.cube, by)
+
+    def nbytes(self) -> int:
+        total = 0
+        for frame in (self.pivot, self.meta, self.cube, *self.attr_counts.values()):
+            if frame is not None:
+                total += int(np.sum(frame.memory_usage(deep=True)))
+                total += int(frame.index.memory_usage(deep=True))
+        return total
+
+
+def _aggregate(chunks: Iterable[pd.DataFrame], progress: Callable[[str, int], None] | None = None,
+               base: _StreamingSummary | None = None,
+               sink: _DatasetPart | None = None) -> _StreamingSummary:
+    # Fold chunks into a fresh state, optionally on top of an existing one (left untouched);
+    # the normalized chunks are also written to sink when persisting datasets.
+    acc = _StreamingSummary()
+    if base is not None:
+        acc.merge(base)
+    phases = _phases()
+    chunks = iter(chunks)
+    try:
+        while True:
+            with _phase("parse"):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            with _phase("aggregate"):
+                df = _prepare(chunk)
+                acc.add_prepared(df)
+            if sink is not None:
+                with _phase("persist"):
+                    sink.write(df)
+            if phases is not None:
+                phases.columns = max(phases.columns or 0, chunk.shape[1])
+            if progress is not None:
+                progress("parsing", acc.rows)
+    finally:
+        if sink is not None:
+            sink.close()
+    if phases is not None:
+        phases.rows = (phases.rows or 0) + acc.rows - (base.rows if base is not None else 0)
+    if progress is not None:
+        progress("aggregating", acc.rows)
+    return acc
+
+
+def _pyarrow_parquet():
+    # Optional dependency: without pyarrow (or with DATASET_DIR="") uploads are not persisted
+    if not DATASET_DIR:
+        return None
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow.parquet
+
+
+class _DatasetPart:
+    # One zstd-compressed Parquet file of normalized rows (a row group per chunk). Only the
+    # summary columns are kept (first, the column the pivot engine counts on when it is on),
+    # all as strings so every chunk shares one schema.
+
+    def __init__(self, path: str):
+        self.path = path
+        self._writer = None
+        self._schema = None
+
+    def write(self, df: pd.DataFrame):
+        import pyarrow as pa
+
+        if self._writer is None:
+            columns = [c for c in REQUIRED_COLUMNS + OPTIONAL_ATTRS if c in df.columns]
+            if SUMMARY_ENGINE == "pivot" and len(df.columns) and df.columns[0] not in columns:
+                columns.insert(0, df.columns[0])
+            self._schema = pa.schema([(c, pa.string()) for c in columns])
+            self._writer = _pyarrow_parquet().ParquetWriter(self.path, self._schema,
+                                                            compression="zstd")
+        out = pd.DataFrame({c: df[c] if c in REQUIRED_COLUMNS else df[c].astype("string")
+                            for c in self._schema.names})
+        self._writer.write_table(pa.Table.from_pandas(out, schema=self._schema,
+                                                      preserve_index=False))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def _dataset_path(key: str) -> str | None:
+    # Report keys are timestamps; anything else (e.g. "..") never maps to a directory
+    if not key.isdigit():
+        return None
+    return os.path.join(DATASET_DIR, key)
+
+
+def _dataset_staging() -> str | None:
+    # Parts are written here first and the directory is renamed to the report key at the end
+    if _pyarrow_parquet() is None:
+        return None
+    os.makedirs(DATASET_DIR, exist_ok=True)
+    return tempfile.mkdtemp(prefix=".staging-", dir=DATASET_DIR)
+
+
+def _dataset_sink(staging: str | None, part: int = 0) -> _DatasetPart | None:
+    if staging is None:
+        return None
+    return _DatasetPart(os.path.join(staging, f"part-{part:05d}.parquet"))
+
+
+def _dataset_parts(path: str | None) -> List[str]:
+    if path is None or not os.path.isdir(path):
+        return []
+    return [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".parquet")]
+
+
+def _commit_dataset(staging: str | None, key: str):
+    if staging is None:
+        return
+    if not _dataset_parts(staging):
+        _discard_dataset(staging)
+        return
+    os.replace(staging, _dataset_path(key))
+    _prune_datasets(keep=key)
+
+
+def _discard_dataset(staging: str | None):
+    if staging is not None:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _prune_datasets(keep: str | None = None):
+    # Expired directories first, then the oldest committed ones until the budget fits. Appends
+    # hard-link their base's parts, so each file is counted (and freed) once across directories.
+    cutoff = time.time() - DATASET_TTL
+    datasets = []
+    for entry in os.scandir(DATASET_DIR):
+        try:
+            if not entry.is_dir():
+                continue
+            mtime = entry.stat().st_mtime
+            if mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+            elif not entry.name.startswith(".staging-"):
+                files = {}
+                for part in os.scandir(entry.path):
+                    st = part.stat()
+                    files[(st.st_dev, st.st_ino)] = st.st_size
+                datasets.append((mtime, entry.name, files))
+        except OSError:
+            pass
+    sizes, links = {}, {}
+    for _, _, files in datasets:
+        sizes.update(files)
+        for inode in files:
+            links[inode] = links.get(inode, 0) + 1
+    size = sum(sizes.values())
+    for _, name, files in sorted(datasets):
+        if size <= DATASET_MAX_BYTES:
+            break
+        if name == keep:
+            continue
+        shutil.rmtree(os.path.join(DATASET_DIR, name), ignore_errors=True)
+        for inode in files:
+            links[inode] -= 1
+            if not links[inode]:
+                size -= sizes[inode]
+
+
+def _iter_dataset(key: str, columns: List[str] | None = None,
+                  filters: list | None = None) -> Iterator[pd.DataFrame]:
+    # Row groups of a persisted upload, reading only the requested columns
+    pq = _pyarrow_parquet()
+    if pq is None:
+        return
+    for part in _dataset_parts(_dataset_path(key)):
+        available = pq.read_schema(part).names
+        wanted = available if columns is None else [c for c in columns if c in available]
+        if filters is not None:
+            yield pq.read_table(part, columns=wanted, filters=filters).to_pandas()
+            continue
+        for batch in pq.ParquetFile(part).iter_batches(columns=wanted):
+            yield batch.to_pandas()
+
+
+def _summary_state(key: str) -> _StreamingSummary | None:
+    # Cached aggregate state, rebuilt from the persisted dataset when it was evicted
+    acc = SUMMARY_CACHE.get(key)
+    if acc is None and _dataset_parts(_dataset_path(key)):
+        # Every persisted column, in order: the pivot engine counts on the first one
+        acc = _aggregate(_iter_dataset(key))
+        SUMMARY_CACHE.put(key, acc, nbytes=acc.nbytes())
+    return acc
+
+
+def _has_summary(key: str) -> bool:
+    return key in SUMMARY_CACHE or bool(_dataset_parts(_dataset_path(key)))
+
+
+def _fmt_pct(df: pd.DataFrame) -> pd.DataFrame:
     out = df.copy()
     if "Completion%" in out.columns:
         out["Completion%"] = (out["Completion%"].fillna(0) * 100).round(2)
-    return out.to_dict(orient="records")
+    return out
+
+
+def _fmt_json(df: pd.DataFrame):
+    return _fmt_pct(df).to_dict(orient="records")
+
+
+def _json_default(o):
+    if isinstance(o, np.generic):
+        return o.item()
+    if isinstance(o, (datetime, pd.Timestamp)):
+        return o.isoformat()
+    return str(o)
+
+
+def _fmt_columns(df: pd.DataFrame) -> str:
+    # Columnar encoding: {"columns": [...], "data": [[col 0 values], ...]}. Each column goes
+    # through the C encoder as one list, so no per-row dicts are built; missing values are null.
+    parts = []
+    for name in df.columns:
+        s = df[name]
+        if name == "Completion%":
+            s = (s.fillna(0) * 100).round(2)
+        if s.dtype.kind in "iub":
+            values = s.tolist()
+        else:
+            values = s.astype(object).where(s.notna(), None).tolist()
+        parts.append(json.dumps(values, default=_json_default))
+    columns = json.dumps([str(c) for c in df.columns])
+    return '{"columns":' + columns + ',"data":[' + ",".join(parts) + "]}"
+
+
+def _summary_body(frames: dict, fmt: str = "records", extra: dict | None = None) -> bytes:
+    # Response body for summary frames, in the legacy records layout or the columnar one
+    if fmt == "records":
+        with app.app_context():
+            return jsonify({**{name: _fmt_json(df) for name, df in frames.items()},
+                            **(extra or {})}).get_data()
+    head = json.dumps({**(extra or {}), "format": fmt}, default=_json_default)
+    body = "".join(f",{json.dumps(name)}:{_fmt_columns(df)}" for name, df in frames.items())
+    return (head[:-1] + body + "}").encode()
+
+
+def _response_format() -> str | None:
+    fmt = request.args.get("format", "records")
+    return fmt if fmt in ("records", "columns") else None
+
+
+def _include_clients() -> bool:
+    # ?clients=0 leaves client_summary out of upload responses for clients that page it from
+    # /api/summary/<key>/clients instead
+    return request.args.get("clients") not in ("0", "false")
+
+
+def _render_report(client_df: pd.DataFrame, zone_df: pd.DataFrame, target=None) -> bytes | None:
+    # Write-only workbook: rows are streamed to the xlsx as they are appended, with the same
+    # sheets and header styling pandas' ExcelWriter produced.
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    wb = Workbook(write_only=True)
+    thin = Side(style="thin")
+    for title, df in (("Client Summary", client_df), ("Zone Summary", zone_df)):
+        ws = wb.create_sheet(title)
+        header = []
+        for name in df.columns:
+            cell = WriteOnlyCell(ws, value=str(name))
+            cell.font = Font(bold=True)
+            cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+            cell.alignment = Alignment(horizontal="center", vertical="top")
+            header.append(cell)
+        ws.append(header)
+        out = _fmt_pct(df).astype(object)
+        for row in out.where(out.notna(), None).itertuples(index=False, name=None):
+            ws.append(row)
+
+    if target is not None:
+        wb.save(target)
+        return None
+    bio = io.BytesIO()
+    wb.save(bio)
+    return bio.getvalue()
+
+
+def _upload_digest(file_storage) -> str:
+    stream = file_storage.stream
+    if isinstance(stream, (_HashingStream, _MultipartUpload)):
+        return stream.hexdigest()
+    sha256 = hashlib.sha256()
+    for block in iter(lambda: file_storage.read(1 << 20), b""):
+        sha256.update(block)
+    file_storage.seek(0)
+    return sha256.hexdigest()
+
+
+def _content_key(file_storage) -> str:
+    # Same bytes, same file type, same counting engine and rules -> same summaries
+    ext = os.path.splitext(file_storage.filename)[1].lower()
+    return f"{_upload_digest(file_storage)}:{ext}:{SUMMARY_ENGINE}:{RULES_VERSION}"
+
+
+def _streamed_upload() -> _MultipartUpload | None:
+    # Streaming reader over a multipart body of known length; None falls back to Werkzeug's
+    # spooled form parsing
+    boundary = request.mimetype_params.get("boundary")
+    if (request.mimetype != "multipart/form-data" or not boundary
+            or request.content_length is None):
+        return None
+    if request.content_length > MAX_CONTENT_LENGTH:
+        raise RequestEntityTooLarge()
+    return _MultipartUpload(request.stream, boundary.encode("latin-1"), request.content_length)
+
+
+def _spool(f: FileStorage) -> FileStorage:
+    # Copy a streamed upload to a hashed temp file for readers that need to seek
+    spool = _HashingStream(tempfile.TemporaryFile())
+    shutil.copyfileobj(f.stream, spool, UPLOAD_READ_BLOCK)
+    f.stream.finish()
+    spool.seek(0)
+    return FileStorage(stream=spool, filename=f.filename)
 
 
 @app.post("/api/upload")
 def upload():
+    # CSVs are rejected on a bad header row before the rest is received; the body is spooled to
+    # disk unless UPLOAD_STREAMING summarizes sync CSVs as it arrives
+    streamed = _streamed_upload()
+    if streamed is not None:
+        if streamed.filename is None:
+            return ("No file part", 400, {"Connection": "close"})
+        f = FileStorage(stream=streamed, filename=streamed.filename)
+    else:
+        with _phase("receive"):
+            request.files
+        if "file" not in request.files:
+            return ("No file part", 400)
+        f = request.files["file"]
+    if not f.filename:
+        return ("No selected file", 400, {"Connection": "close"})
+    if not _ext_ok(f.filename):
+        return ("Unsupported file type", 400, {"Connection": "close"})
+
+    fmt = _response_format()
+    if fmt is None:
+        return ("format must be records or columns", 400, {"Connection": "close"})
+    preview = _preview_rows()
+    if preview is None:
+        return ("preview must be true or a positive number of rows", 400, {"Connection": "close"})
+    run_async = preview > 0 or request.args.get("async") in ("1", "true")
+    clients = _include_clients()
+
+    with _phase("receive"):
+        _check_header(f)
+        if streamed is not None and (not UPLOAD_STREAMING or run_async
+                                     or not f.filename.lower().endswith(".csv")):
+            f = _spool(f)
+    if isinstance(f.stream, _MultipartUpload):
+        return _upload_streamed(f, fmt, clients)
+
+    content_key = _content_key(f)
+    cached = _cached_upload(content_key, fmt, clients)
+    if run_async:
+        return _submit_job(f, content_key, cached, fmt, preview, clients)
+    if cached is not None:
+        return app.response_class(cached[1], mimetype="application/json")
+
+    with _admitted(_upload_cost([f])):
+        staging = _dataset_staging()
+        try:
+            acc = _aggregate(_iter_upload(f), sink=_dataset_sink(staging))
+        except BaseException:
+            _discard_dataset(staging)
+            raise
+        _, body = _store_result(acc, content_key, dataset=staging, fmt=fmt, clients=clients)
+    return app.response_class(body, mimetype="application/json")
+
+
+def _upload_streamed(f: FileStorage, fmt: str, clients: bool = True):
+    # The digest is only known once the body has been read, so the memo is checked afterwards
+    # and a repeated upload returns the earlier result (and report key)
+    with _admitted(_upload_cost([f])):
+        staging = _dataset_staging()
+        try:
+            acc = _aggregate(_iter_upload(f), sink=_dataset_sink(staging))
+            f.stream.finish()
+        except BaseException:
+            _discard_dataset(staging)
+            raise
+        content_key = _content_key(f)
+        cached = _cached_upload(content_key, fmt, clients)
+        if cached is not None:
+            _discard_dataset(staging)
+            return app.response_class(cached[1], mimetype="application/json")
+        _, body = _store_result(acc, content_key, dataset=staging, fmt=fmt, clients=clients)
+    return app.response_class(body, mimetype="application/json")
+
+
+class _Busy(Exception):
+    pass
+
+
+@app.errorhandler(_Busy)
+def _busy(exc):
+    return ("Server busy, retry shortly", 503, {"Retry-After": str(ADMISSION_RETRY_AFTER)})
+
+
+@app.errorhandler(_SchemaError)
+def _schema_error(exc):
+    # A streamed body may be only partly read: close the connection instead of draining it
+    return (str(exc), 400, {"Connection": "close"})
+
+
+def _upload_cost(files) -> int:
+    # Estimated peak memory of parsing these uploads (spooled, or streamed with a known length)
+    cost = ADMISSION_OVERHEAD
+    for f in files:
+        if isinstance(f.stream, _MultipartUpload):
+            cost += f.stream.size * ADMISSION_EXPANSION[".csv"]
+            continue
+        f.stream.seek(0, os.SEEK_END)
+        size = f.stream.tell()
+        f.stream.seek(0)
+        cost += size * ADMISSION_EXPANSION.get(os.path.splitext(f.filename)[1].lower(), 8)
+    return cost
+
+
+@contextmanager
+def _admitted(cost: int):
+    # Hold an admission slot for the parse; raises _Busy (-> 503) when the queue is full or
+    # no room frees up in time
+    start = time.perf_counter()
+    with _phase("queue"):
+        ok = ADMISSION.acquire(cost)
+    _METRICS["admission_wait"].observe(time.perf_counter() - start, request.endpoint or "unknown")
+    if not ok:
+        raise _Busy()
+    try:
+        yield
+    finally:
+        ADMISSION.release(cost)
+
+
+def _memo_key(content_key: str, fmt: str, clients: bool = True) -> str:
+    key = content_key if fmt == "records" else f"{content_key}:{fmt}"
+    return key if clients else f"{key}:noclients"
+
+
+def _cached_upload(content_key: str, fmt: str = "records",
+                   clients: bool = True) -> Tuple[str, bytes] | None:
+    cached = UPLOAD_CACHE.get(_memo_key(content_key, fmt, clients))
+    if cached is not None and _has_summary(cached[0]):
+        return cached
+    return None
+
+
+def _store_result(acc: _StreamingSummary, content_key: str, extra: dict | None = None,
+                  dataset: str | None = None, fmt: str = "records",
+                  clients: bool = True) -> Tuple[str, bytes]:
+    # Keep only the aggregate state; the workbook is rendered on the first download
+    try:
+        with _phase("finish"):
+            client_df, zone_df = acc.finish()
+    except BaseException:
+        _discard_dataset(dataset)
+        raise
+    key = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+    with _phase("store"):
+        SUMMARY_CACHE.put(key, acc, nbytes=acc.nbytes())
+    with _phase("persist"):
+        _commit_dataset(dataset, key)
+
+    with _phase("serialize"):
+        frames = {"client_summary": client_df, "zone_summary": zone_df}
+        if not clients:
+            del frames["client_summary"]
+        body = _summary_body(frames, fmt, {"report_key": key, **(extra or {})})
+    UPLOAD_CACHE.put(_memo_key(content_key, fmt, clients), (key, body), nbytes=len(body))
+    return key, body
+
+
+def _job_pool() -> Tuple[ProcessPoolExecutor, Any]:
+    # Created on first use so sync-only deployments never fork workers or a manager
+    global _JOB_POOL, _JOB_PROGRESS
+    with _JOB_POOL_LOCK:
+        if _JOB_POOL is None:
+            _JOB_PROGRESS = multiprocessing.Manager().dict()
+            _JOB_POOL = ProcessPoolExecutor(max_workers=JOB_WORKERS)
+        return _JOB_POOL, _JOB_PROGRESS
+
+
+def _job_submit(fn: Callable, *args):
+    # A dead worker (e.g. OOM-killed) breaks the whole pool: replace it once and resubmit.
+    # BrokenProcessPool from the retry is left to the caller.
+    global _JOB_POOL
+    pool, _ = _job_pool()
+    try:
+        return pool.submit(fn, *args)
+    except BrokenProcessPool:
+        with _JOB_POOL_LOCK:
+            if _JOB_POOL is pool:
+                _JOB_POOL = None
+        pool.shutdown(wait=False)
+    return _job_pool()[0].submit(fn, *args)
+
+
+def _run_job(job_id: str, path: str, filename: str, progress,
+             staging: str | None = None) -> _StreamingSummary:
+    # Runs in a pool worker; progress is a Manager dict shared with the web process
+    def report(phase: str, rows: int):
+        progress[job_id] = {"phase": phase, "rows": rows}
+
+    report("parsing", 0)
+    with open(path, "rb") as fh:
+        upload = FileStorage(stream=fh, filename=filename)
+        return _aggregate(_iter_upload(upload), report, sink=_dataset_sink(staging))
+
+
+def _preview_rows() -> int | None:
+    # ?preview=true summarizes PREVIEW_ROWS rows, ?preview=N up to that many; 0 when absent
+    # and None when invalid
+    value = request.args.get("preview")
+    if not value:
+        return 0
+    if value == "true":
+        return PREVIEW_ROWS
+    try:
+        rows = int(value)
+    except ValueError:
+        return None
+    return min(rows, PREVIEW_ROWS) if rows > 0 else None
+
+
+def _preview(file_storage, rows: int) -> _StreamingSummary:
+    # Summaries of the first rows of the upload only; rewinds it for the full pass. Parsed in
+    # the web process, so it takes an admission slot like a synchronous upload.
+    acc = _StreamingSummary()
+    try:
+        with _admitted(_upload_cost([file_storage])), _phase("preview"):
+            for chunk in _iter_upload(file_storage, nrows=rows):
+                acc.add(chunk)
+    finally:
+        file_storage.seek(0)
+    return acc
+
+
+def _submit_job(file_storage, content_key: str, cached: Tuple[str, bytes] | None,
+                fmt: str = "records", preview: int = 0, clients: bool = True):
+    _prune_jobs()
+    job_id = uuid.uuid4().hex
+    job = {"status": "queued", "created": time.time(), "finished": None, "rows": None,
+           "report_key": None, "body": None, "error": None, "error_status": None}
+
+    if cached is not None:
+        job.update(status="done", finished=time.time(), report_key=cached[0], body=cached[1])
+        with _JOBS_LOCK:
+            _JOBS[job_id] = job
+        _publish_job(job_id, job)
+        return jsonify({"job_id": job_id, "status": "done"}), 202
+
+    with _JOBS_LOCK:
+        pending = sum(1 for j in _JOBS.values() if j["status"] in ("queued", "running"))
+    if pending >= JOB_MAX_PENDING:
+        return ("Too many uploads in progress, retry shortly", 503, {"Retry-After": "5"})
+    # Before queueing: a file the preview rejects (e.g. missing columns) is not worth a job
+    approx = _preview(file_storage, preview) if preview else None
+
+    ext = os.path.splitext(file_storage.filename)[1].lower()
+    fd, path = tempfile.mkstemp(prefix="upload-", suffix=ext)
+    with os.fdopen(fd, "wb") as out:
+        file_storage.save(out)
+
+    _, progress = _job_pool()
+    staging = _dataset_staging()
+    try:
+        future = _job_submit(_run_job, job_id, path, file_storage.filename, progress, staging)
+    except BrokenProcessPool:
+        os.remove(path)
+        _discard_dataset(staging)
+        return ("Upload workers unavailable, retry shortly", 503, {"Retry-After": "5"})
+    # Registered before the callback is attached, so _finish_job always finds it
+    job["future"] = future
+    with _JOBS_LOCK:
+        _JOBS[job_id] = job
+    _publish_job(job_id, job)
+    future.add_done_callback(lambda fut: _finish_job(job_id, content_key, path, fut, staging, fmt,
+                                                     clients))
+    if approx is None:
+        return jsonify({"job_id": job_id, "status": "queued"}), 202
+    # Approximate summaries of the first rows; /api/jobs/<id>/result has the exact ones later
+    client_df, zone_df = approx.finish()
+    body = _summary_body({"client_summary": client_df, "zone_summary": zone_df}, fmt,
+                         {"job_id": job_id, "status": "queued", "approximate": True,
+                          "rows_sampled": approx.rows})
+    return app.response_class(body, status=202, mimetype="application/json")
+
+
+def _finish_job(job_id: str, content_key: str, path: str, future, staging: str | None = None,
+                fmt: str = "records", clients: bool = True):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+    job = _JOBS.get(job_id)
+    if job is None:
+        _discard_dataset(staging)
+        return
+    try:
+        key, body = _store_result(future.result(), content_key, dataset=staging, fmt=fmt,
+                                  clients=clients)
+    except Exception as exc:  # surfaced through /api/jobs/<id>
+        _discard_dataset(staging)
+        job.update(status="failed", error=str(exc) or type(exc).__name__,
+                   error_status=400 if isinstance(exc, ValueError) else 500)
+    else:
+        job.update(status="done", report_key=key, body=body)
+    job["finished"] = time.time()
+    if _JOB_PROGRESS is not None:
+        job["rows"] = _JOB_PROGRESS.pop(job_id, {}).get("rows")
+    _publish_job(job_id, job)
+
+
+def _publish_job(job_id: str, job: dict):
+    JOB_STORE.put(job_id, {k: v for k, v in job.items() if k != "future"},
+                  nbytes=len(job["body"] or b"") + 256)
+
+
+def _find_job(job_id: str) -> dict | None:
+    # This process's job (with live progress) or one published by another worker
+    job = _JOBS.get(job_id)
+    return job if job is not None else JOB_STORE.get(job_id)
+
+
+def _prune_jobs():
+    cutoff = time.time() - REPORT_CACHE_TTL
+    with _JOBS_LOCK:
+        for job_id in [k for k, j in _JOBS.items() if j["finished"] and j["finished"] < cutoff]:
+            del _JOBS[job_id]
+
+
+def _job_state(job_id: str, job: dict) -> dict:
+    status = job["status"]
+    future = job.get("future")
+    if status == "queued" and future is not None and future.running():
+        status = "running"
+    state = {"job_id": job_id, "status": status, "phase": "queued" if status == "queued" else status,
+             "rows": job["rows"], "report_key": job["report_key"], "error": job["error"]}
+    if status == "running" and _JOB_PROGRESS is not None:
+        state.update(_JOB_PROGRESS.get(job_id, {}))
+    return state
+
+
+def _partial_summary(path: str, filename: str, sheet: int,
+                     part: str | None = None) -> _StreamingSummary:
+    # Runs in a pool worker: one file/sheet reduced to mergeable partial counts
+    sink = _DatasetPart(part) if part is not None else None
+    with open(path, "rb") as fh:
+        return _aggregate(_iter_upload(FileStorage(stream=fh, filename=filename), sheet), sink=sink)
+
+
+@app.post("/api/upload/batch")
+def upload_batch():
+    with _phase("receive"):
+        request.files
+    files = [f for f in request.files.getlist("files") + request.files.getlist("file") if f.filename]
+    if not files:
+        return ("No file part", 400)
+    bad = [f.filename for f in files if not _ext_ok(f.filename)]
+    if bad:
+        return ("Unsupported file type: " + ", ".join(bad), 400)
+    fmt = _response_format()
+    if fmt is None:
+        return ("format must be records or columns", 400)
+
+    clients = _include_clients()
+
+    content_key = "batch:" + hashlib.sha256(
+        "|".join(_content_key(f) for f in files).encode()).hexdigest()
+    cached = _cached_upload(content_key, fmt, clients)
+    if cached is not None:
+        return app.response_class(cached[1], mimetype="application/json")
+
+    with _admitted(_upload_cost(files)):
+        staging = _dataset_staging()
+        paths: List[str] = []
+        units = []
+        try:
+            for f in files:
+                ext = os.path.splitext(f.filename)[1].lower()
+                fd, path = tempfile.mkstemp(prefix="upload-", suffix=ext)
+                with os.fdopen(fd, "wb") as out:
+                    f.save(out)
+                paths.append(path)
+                with open(path, "rb") as fh:
+                    sheets = _sheet_names(FileStorage(stream=fh, filename=f.filename))
+                for i, sheet in enumerate(sheets):
+                    sink = _dataset_sink(staging, len(units))
+                    part = sink.path if sink is not None else None
+                    future = _job_submit(_partial_summary, path, f.filename, i, part)
+                    units.append(({"file": f.filename, "sheet": sheet}, future, part))
+
+            # Merge in upload order so first-seen State/Tier match a single concatenated file
+            acc = _StreamingSummary()
+            sources, skipped = [], []
+            for source, future, part in units:
+                try:
+                    partial = future.result()
+                except ValueError as exc:  # e.g. a notes sheet without the summary columns
+                    skipped.append({**source, "error": str(exc)})
+                    if part is not None and os.path.exists(part):
+                        os.remove(part)
+                    continue
+                acc.merge(partial)
+                sources.append({**source, "rows": partial.rows})
+        except BrokenProcessPool:  # no workers after a retry, or one died mid-batch
+            _discard_dataset(staging)
+            return ("Upload workers unavailable, retry shortly", 503, {"Retry-After": "5"})
+        except BaseException:
+            _discard_dataset(staging)
+            raise
+        finally:
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+        if not sources:
+            _discard_dataset(staging)
+            return ("; ".join(f"{s['file']} [{s['sheet']}]: {s['error']}" for s in skipped), 400)
+        _, body = _store_result(acc, content_key, extra={"sources": sources, "skipped": skipped},
+                                dataset=staging, fmt=fmt, clients=clients)
+    return app.response_class(body, mimetype="application/json")
+
+
+@app.get("/api/jobs/<job_id>")
+def job_status(job_id: str):
+    job = _find_job(job_id)
+    if job is None:
+        return ("Unknown job", 404)
+    return jsonify(_job_state(job_id, job))
+
+
+@app.get("/api/jobs/<job_id>/result")
+def job_result(job_id: str):
+    job = _find_job(job_id)
+    if job is None:
+        return ("Unknown job", 404)
+    if job["status"] == "failed":
+        return (job["error"], job["error_status"])
+    if job["status"] != "done":
+        return jsonify(_job_state(job_id, job)), 202
+    return app.response_class(job["body"], mimetype="application/json")
+
+
+def _report_path(key: str) -> str | None:
+    path = REPORT_STORE.get(key)
+    if path is None:
+        with _phase("state"):
+            result = _summary_state(key)
+        if result is None:
+            return None
+        with _phase("finish"):
+            client_df, zone_df = result.finish()
+        with _phase("render"):
+            path = REPORT_STORE.put(key, lambda fh: _render_report(client_df, zone_df, fh))
+    return path
+
+
+@app.post("/api/report/<key>/append")
+def append_report(key: str):
+    # Fold a delta file into an existing report's aggregate state; only the delta is parsed.
+    # The result gets a new report_key, the original stays downloadable until it expires.
+    with _phase("state"):
+        base = _summary_state(key)
+    if base is None:
+        return ("Report expired", 404)
+    with _phase("receive"):
+        request.files
     if "file" not in request.files:
         return ("No file part", 400)
     f = request.files["file"]
@@ -776,45 +2927,259 @@ def upload():
     if not _ext_ok(f.filename):
         return ("Unsupported file type", 400)
 
-    df = _read_upload(f)
-    client_df, zone_df = _summaries(df)
-
-    # Build an Excel report in-memory
-    bio = io.BytesIO()
-    with pd.ExcelWriter(bio, engine="openpyxl") as writer:
-        cd = client_df.copy(); zd = zone_df.copy()
-        for d in (cd, zd):
-            if "Completion%" in d.columns:
-                d["Completion%"] = (d["Completion%"].fillna(0) * 100).round(2)
-        cd.to_excel(writer, index=False, sheet_name="Client Summary")
-        zd.to_excel(writer, index=False, sheet_name="Zone Summary")
-    bio.seek(0)
-
-    key = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
-    REPORT_CACHE[key] = bio.getvalue()
-
-    return jsonify({
-        "client_summary": _fmt_json(client_df),
-        "zone_summary": _fmt_json(zone_df),
-        "report_key": key,
-    })
+    fmt = _response_format()
+    if fmt is None:
+        return ("format must be records or columns", 400)
+
+    clients = _include_clients()
+
+    content_key = f"append:{key}:{_content_key(f)}"
+    cached = _cached_upload(content_key, fmt, clients)
+    if cached is not None:
+        return app.response_class(cached[1], mimetype="application/json")
+
+    with _admitted(_upload_cost([f])):
+        # The new dataset shares the base's parts (hard links where possible) plus the delta
+        base_parts = _dataset_parts(_dataset_path(key))
+        staging = _dataset_staging() if base_parts else None
+        try:
+            if staging is not None:
+                for part in base_parts:
+                    target = os.path.join(staging, os.path.basename(part))
+                    try:
+                        os.link(part, target)
+                    except OSError:
+                        shutil.copyfile(part, target)
+            acc = _aggregate(_iter_upload(f), base=base, sink=_dataset_sink(staging, len(base_parts)))
+        except BaseException:
+            _discard_dataset(staging)
+            raise
+        _, body = _store_result(acc, content_key, extra={"base_report_key": key}, dataset=staging,
+                                fmt=fmt, clients=clients)
+    return app.response_class(body, mimetype="application/json")
+
+
+@app.get("/api/summary/<key>")
+def summary_by(key: str):
+    # Ad-hoc rollups such as ?by=State,Tier, answered from the upload's count cube
+    by = [c.strip() for c in request.args.get("by", "Zone").split(",") if c.strip()]
+    by = [RULES.column(c) for c in by]
+    dims = [c for c in CUBE_DIMENSIONS if c != "Order Status"]
+    bad = [c for c in by if c not in dims]
+    if not by or bad or len(set(by)) != len(by):
+        return ("by must be a comma-separated list of: " + ", ".join(dims), 400)
+    fmt = _response_format()
+    if fmt is None:
+        return ("format must be records or columns", 400)
+    acc = _summary_state(key)
+    if acc is None:
+        return ("Report expired", 404)
+    body = _summary_body({"summary": acc.rollup(by)}, fmt, {"by": by})
+    return app.response_class(body, mimetype="application/json")
+
+
+def _client_table(key: str) -> Tuple[pd.DataFrame, pd.Series] | None:
+    # Built once per report: the client summary as the upload response formats it, and one
+    # lowercase string per row (cells joined by \x1f) so text filters are a single scan
+    cached = TABLE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    acc = _summary_state(key)
+    if acc is None:
+        return None
+    table = _fmt_pct(acc.finish()[0]).reset_index(drop=True)
+    cells = [table[c].astype(object).where(table[c].notna(), "").astype(str).str.lower().to_numpy()
+             for c in table.columns]
+    search = cells[0]
+    for col in cells[1:]:
+        search = search + "\x1f" + col
+    search = pd.Series(search, index=table.index, dtype=object)
+    nbytes = int(table.memory_usage(deep=True).sum()) + int(search.memory_usage(deep=True))
+    TABLE_CACHE.put(key, (table, search), nbytes=nbytes)
+    return table, search
+
+
+@app.get("/api/summary/<key>/clients")
+def client_page(key: str):
+    # One page of the client summary: ?offset=&limit=&sort=<column>&order=asc|desc&q=<text>
+    cached = _client_table(key)
+    if cached is None:
+        return ("Report expired", 404)
+    table, search = cached
+    try:
+        limit = min(max(int(request.args.get("limit", 100)), 0), TABLE_PAGE_MAX)
+        offset = max(int(request.args.get("offset", 0)), 0)
+    except ValueError:
+        return ("limit and offset must be integers", 400)
+    sort = request.args.get("sort")
+    if sort and sort not in table.columns:
+        return ("Unknown sort column: " + sort, 400)
+    descending = request.args.get("order", "asc").lower() == "desc"
+
+    rows = table
+    q = request.args.get("q", "").strip().lower()
+    if q:
+        rows = table[search.str.contains(q, regex=False).to_numpy()]
+    if sort:
+        try:
+            rows = rows.sort_values(sort, ascending=not descending, kind="stable", na_position="last")
+        except TypeError:
+            # Mixed cell types (e.g. xlsx State with numbers and text): order as text
+            rows = rows.sort_values(sort, ascending=not descending, kind="stable", na_position="last",
+                                    key=lambda s: s.where(s.isna(), s.astype(str)))
+    page = rows.iloc[offset:offset + limit].astype(object)
+    page = page.where(page.notna(), None)
+    return jsonify({"rows": page.to_dict(orient="records"), "total": int(len(rows)),
+                    "offset": offset, "limit": limit, "columns": list(table.columns)})
+
+
+@app.get("/api/report/<key>/rows")
+def report_rows(key: str):
+    # Drill-down into the persisted rows behind a report: ?zone=&client=&status=&columns=
+    if not _dataset_parts(_dataset_path(key)):
+        return ("Report rows not available", 404)
+    filters = [(col, "==", request.args[arg])
+               for arg, col in (("zone", "Zone"), ("client", "Client Name"), ("status", "Order Status"))
+               if request.args.get(arg)]
+    columns = [c for c in request.args.get("columns", "").split(",") if c] or None
+    try:
+        limit = min(max(int(request.args.get("limit", 100)), 0), 10_000)
+        offset = max(int(request.args.get("offset", 0)), 0)
+    except ValueError:
+        return ("limit and offset must be integers", 400)
+
+    frames = list(_iter_dataset(key, columns, filters or None))
+    rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    page = rows.iloc[offset:offset + limit].astype(object)
+    page = page.where(page.notna(), None)
+    return jsonify({"rows": page.to_dict(orient="records"), "total": int(len(rows)), "offset": offset, "limit": limit})
 
 
 @app.get("/api/report/<key>")
 def report(key: str):
-    data = REPORT_CACHE.get(key)
-    if not data:
+    path = _report_path(key)
+    if not path:
         return ("Report expired", 404)
     filename = f"summary_{key}.xlsx"
-    return send_file(io.BytesIO(data),
-                     mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                     as_attachment=True,
-                     download_name=filename)
+    # A real path lets the server use sendfile; conditional handles ETag/304 and Range/206
+    response = send_file(path,
+                         mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                         as_attachment=True,
+                         download_name=filename,
+                         conditional=True,
+                         etag=True)
+    response.headers.setdefault("Accept-Ranges", "bytes")
+    return response
+
+
+@app.before_request
+def _start_phases():
+    if request.path.startswith("/api/"):
+        g.phases = _Phases()
+
+
+@app.after_request
+def _finish_phases(response):
+    # Server-Timing for the browser's network panel, histograms for /metrics
+    phases = g.pop("phases", None)
+    if phases is None:
+        return response
+    total = time.perf_counter() - phases.started
+    endpoint = request.endpoint or "unknown"
+    timings = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in phases.seconds.items()]
+    response.headers["Server-Timing"] = ", ".join(timings + [f"total;dur={total * 1000:.1f}"])
+
+    _METRICS["request"].observe(total, endpoint, str(response.status_code))
+    for name, seconds in phases.seconds.items():
+        _METRICS["phase"].observe(seconds, endpoint, name)
+    for name, grown in phases.memory.items():
+        _METRICS["memory"].observe(grown, endpoint, name)
+    if phases.rows is not None:
+        _METRICS["rows"].observe(phases.rows, endpoint)
+    if phases.columns is not None:
+        _METRICS["columns"].observe(phases.columns, endpoint)
+    if response.status_code < 400:
+        size = response.calculate_content_length()
+        if size is None and response.direct_passthrough:
+            size = response.content_length  # send_file sets it from the file size
+        if size is not None:
+            _METRICS["output"].observe(size, endpoint)
+    return response
+
+
+def _peak_rss() -> int | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@app.get("/metrics")
+def metrics():
+    # Prometheus text exposition; counters and histograms are per process
+    lines: List[str] = []
+    for histogram in _METRICS.values():
+        lines += histogram.render()
+
+    caches = {"report": REPORT_STORE, "summary": SUMMARY_CACHE, "upload": UPLOAD_CACHE,
+              "table": TABLE_CACHE}
+    stats = {name: cache.stats() for name, cache in caches.items()}
+    for field, kind, help_text in (
+            ("entries", "gauge", "Entries held."),
+            ("bytes", "gauge", "Bytes held."),
+            ("max_bytes", "gauge", "Byte budget."),
+            ("hits", "counter", "Lookups that found an entry."),
+            ("misses", "counter", "Lookups that found nothing."),
+            ("evictions", "counter", "Entries dropped to stay within budget."),
+            ("expirations", "counter", "Entries dropped after their ttl.")):
+        name = f"summarizer_cache_{field}" + ("_total" if kind == "counter" else "")
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        lines += [f'{name}{{cache="{cache}"}} {s[field]}' for cache, s in stats.items()]
+    lines += ["# HELP summarizer_cache_hit_ratio Hits over lookups since start.",
+              "# TYPE summarizer_cache_hit_ratio gauge"]
+    for cache, s in stats.items():
+        lookups = s["hits"] + s["misses"]
+        lines.append(f'summarizer_cache_hit_ratio{{cache="{cache}"}} '
+                     f'{s["hits"] / lookups if lookups else 0:.4f}')
+
+    admission = ADMISSION.stats()
+    for field, kind, help_text in (
+            ("active", "gauge", "Uploads currently parsing under admission control."),
+            ("in_use_bytes", "gauge", "Estimated memory charged by the active uploads."),
+            ("budget_bytes", "gauge", "Admission memory budget."),
+            ("queue_depth", "gauge", "Uploads waiting for admission."),
+            ("admitted", "counter", "Uploads admitted."),
+            ("rejected", "counter", "Uploads rejected with 503.")):
+        name = f"summarizer_admission_{field}" + ("_total" if kind == "counter" else "")
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {admission[field]}"]
+    with _JOBS_LOCK:
+        pending = sum(1 for j in _JOBS.values() if j["status"] in ("queued", "running"))
+    lines += ["# HELP summarizer_jobs_pending Async jobs queued or running.",
+              "# TYPE summarizer_jobs_pending gauge", f"summarizer_jobs_pending {pending}"]
+
+    peak = _peak_rss()
+    if peak is not None:
+        lines += ["# HELP process_peak_rss_bytes Peak resident set size.",
+                  "# TYPE process_peak_rss_bytes gauge", f"process_peak_rss_bytes {peak}"]
+    return app.response_class("\n".join(lines) + "\n",
+                              mimetype="text/plain; version=0.0.4; charset=utf-8")
 
 
 @app.route("/")
 def index():
-    return render_template_string(HTML_TEMPLATE)
+    # Static page: gzipped bytes when accepted, conditional GET on the representation's ETag
+    gzipped = request.accept_encodings.quality("gzip") > 0
+    response = app.response_class(_UI_GZIP if gzipped else _UI_BODY, mimetype="text/html")
+    if gzipped:
+        response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    response.set_etag(_UI_ETAG + ("-gz" if gzipped else ""))
+    response.cache_control.public = True
+    response.cache_control.max_age = UI_CACHE_MAX_AGE
+    return response.make_conditional(request)
 
 
 if __name__ == "__main__":
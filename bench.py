@@ -0,0 +1,209 @@
+"""Benchmarks for the upload pipeline on seeded synthetic data.
+
+Each phase is timed separately for every rows × columns combination and one JSON object per
+measurement is printed (and appended to --output), e.g.
+
+    python bench.py                                   # quick matrix
+    python bench.py --rows 10k,100k,1M,10M --cols 5,20,100,200 --output bench_output.txt
+    python bench.py --rows 50k --cols 100 --formats xlsx --repeat 5
+    python bench.py --check --rows 250k                # CSV output vs the pre-series reader
+"""
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+from werkzeug.datastructures import FileStorage
+
+import app
+
+XLSX_MAX_ROWS = 1_048_575  # Excel's sheet limit, minus the header row
+
+ZONES = ["North", "South", "East", "West", "Central"]
+STATES = ["KA", "UP", "MH", "TN", "GJ", "RJ", "WB", "DL"]
+TIERS = ["T1", "T2", "T3"]
+# Canonical statuses plus the spellings real exports contain; the tail is left unmapped
+STATUSES = ["Completed", "completed", " COMPLETE ", "Complete", "Pending", "pending ", "PENDING",
+            "HOLD", "hold", "Hold", "Cancelled", "canceled", "CANCELLED", "Returned", "In Transit"]
+STATUS_WEIGHTS = [20, 8, 2, 3, 10, 3, 1, 6, 2, 1, 6, 3, 1, 4, 2]
+
+
+def _count(text: str) -> int:
+    text = text.strip().lower().replace("_", "")
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def generate(rows: int, cols: int, seed: int = 0) -> pd.DataFrame:
+    # Order-export shaped data: ~1 client per 50 orders, State/Tier partly missing, filler
+    # columns alternating numbers, free text and dates up to the requested width
+    rng = np.random.default_rng(seed)
+    n_clients = max(rows // 50, 10)
+    clients = np.array([f"Client {i:06d}" for i in range(n_clients)], dtype=object)
+    client_ids = rng.integers(0, n_clients, rows)
+    weights = np.array(STATUS_WEIGHTS, dtype=float)
+
+    data = {
+        "Order ID": np.arange(1, rows + 1),
+        "Zone": np.array(ZONES, dtype=object)[client_ids % len(ZONES)],
+        "Client Name": clients[client_ids],
+        "Order Status": np.array(STATUSES, dtype=object)[
+            rng.choice(len(STATUSES), rows, p=weights / weights.sum())],
+        "State": np.where(rng.random(rows) < 0.2, None,
+                          np.array(STATES, dtype=object)[client_ids % len(STATES)]),
+        "Tier": np.where(rng.random(rows) < 0.3, None,
+                         np.array(TIERS, dtype=object)[client_ids % len(TIERS)]),
+    }
+    base = pd.Timestamp("2024-01-01")
+    for i in range(max(cols - len(data), 0)):
+        kind = i % 3
+        if kind == 0:
+            data[f"Amount {i}"] = rng.normal(1000, 250, rows).round(2)
+        elif kind == 1:
+            data[f"Note {i}"] = np.array(["ok", "late", "priority", "", "callback"], dtype=object)[
+                rng.integers(0, 5, rows)]
+        else:
+            data[f"Date {i}"] = base + pd.to_timedelta(rng.integers(0, 365, rows), unit="D")
+    return pd.DataFrame(data).iloc[:, :cols]
+
+
+def numeric_keys(df: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    # Zones and clients spelled as numbers ("1", "01", "1.0", blanks), which read_csv infers as
+    # numeric keys; the summaries must group and print them exactly as before the series
+    rng = np.random.default_rng(seed)
+    ids = df["Client Name"].str[-6:].astype(int).to_numpy()
+    spellings = np.array(["{}", "0{}", "{}.0", " {}"], dtype=object)
+    pick = rng.integers(0, len(spellings), len(df))
+    out = df.copy()
+    out["Zone"] = [spellings[p].format(z) for p, z in zip(pick, ids % 5 + 1)]
+    out.loc[rng.random(len(df)) < 0.01, "Zone"] = None
+    out["Client Name"] = [spellings[p].format(c) for p, c in zip(pick[::-1], ids)]
+    return out
+
+
+def encode(df: pd.DataFrame, fmt: str) -> bytes:
+    bio = io.BytesIO()
+    if fmt == "csv":
+        df.to_csv(bio, index=False)
+    else:
+        with pd.ExcelWriter(bio, engine="openpyxl") as writer:
+            df.to_excel(writer, index=False, sheet_name="Orders")
+    return bio.getvalue()
+
+
+def _time(fn: Callable[[], object], repeat: int) -> tuple:
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def run_case(rows: int, cols: int, fmt: str, repeat: int, seed: int) -> List[dict]:
+    df = generate(rows, cols, seed)
+    payload = encode(df, fmt)
+    name = f"bench.{fmt}"
+
+    def read():
+        return app._read_upload(FileStorage(stream=io.BytesIO(payload), filename=name))
+
+    results = []
+
+    def record(phase: str, times: List[float], **extra):
+        results.append({
+            "phase": phase, "format": fmt, "rows": rows, "cols": cols, "repeat": repeat,
+            "min_s": round(min(times), 6), "median_s": round(statistics.median(times), 6),
+            "rows_per_s": round(rows / min(times)) if min(times) else None,
+            "input_bytes": len(payload), **extra,
+        })
+
+    def aggregate():
+        # The server's upload path: per-chunk fold (counts, cube, attributes) plus the Parquet
+        # sink when pyarrow is available; the staged dataset is thrown away
+        upload = FileStorage(stream=io.BytesIO(payload), filename=name)
+        staging = app._dataset_staging()
+        try:
+            return app._aggregate(app._iter_upload(upload), sink=app._dataset_sink(staging)).finish()
+        finally:
+            app._discard_dataset(staging)
+
+    times, (client_df, _) = _time(aggregate, repeat)
+    record("aggregate", times, clients=len(client_df))
+    times, frame = _time(read, repeat)
+    record("read", times)
+    times, _ = _time(lambda: app._coerce(app._normalize(frame)), repeat)
+    record("normalize", times)
+    times, (client_df, zone_df) = _time(lambda: app._summaries(frame), repeat)
+    record("summaries", times, clients=len(client_df))
+    times, _ = _time(lambda: (app._fmt_json(client_df), app._fmt_json(zone_df)), repeat)
+    record("fmt_json", times, clients=len(client_df))
+    times, report = _time(lambda: app._render_report(client_df, zone_df), repeat)
+    record("render", times, clients=len(client_df), output_bytes=len(report))
+    return results
+
+
+def check_case(rows: int, cols: int, seed: int) -> List[str]:
+    # The server's CSV path against the pre-series reader (whole file via read_csv in 100k
+    # chunks, no projection or category dtype) on data with numeric-looking keys
+    payload = encode(numeric_keys(generate(rows, cols, seed), seed), "csv")
+    upload = FileStorage(stream=io.BytesIO(payload), filename="check.csv")
+    served = app._aggregate(app._iter_upload(upload)).finish()
+    frame = pd.concat(pd.read_csv(io.BytesIO(payload), chunksize=100_000, low_memory=False),
+                      ignore_index=True)
+    frame.columns = [str(c).strip() for c in frame.columns]
+    expected = app._summaries(frame)
+    return [f"{name} differs for rows={rows} cols={cols}"
+            for name, got, want in zip(("client_summary", "zone_summary"), served, expected)
+            if app._fmt_json(got) != app._fmt_json(want)]
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="10k,50k,100k", help="comma-separated, k/M suffixes ok")
+    parser.add_argument("--cols", default="5,20,100")
+    parser.add_argument("--formats", default="csv,xlsx")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also append JSON lines to this file")
+    parser.add_argument("--check", action="store_true",
+                        help="compare CSV summaries with the pre-series reader instead of timing")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        failures = [failure for rows in [_count(r) for r in args.rows.split(",")]
+                    for cols in [int(c) for c in args.cols.split(",")]
+                    for failure in check_case(rows, cols, args.seed)]
+        for failure in failures:
+            print(failure, file=sys.stderr)
+        return 1 if failures else 0
+
+    meta = {"python": platform.python_version(), "pandas": pd.__version__, "numpy": np.__version__,
+            "rules_version": app.RULES_VERSION, "engine": app.SUMMARY_ENGINE}
+    out = open(args.output, "a") if args.output else None
+    try:
+        for fmt in [f.strip() for f in args.formats.split(",") if f.strip()]:
+            for rows in [_count(r) for r in args.rows.split(",")]:
+                for cols in [int(c) for c in args.cols.split(",")]:
+                    if fmt == "xlsx" and rows > XLSX_MAX_ROWS:
+                        print(f"skipping xlsx with {rows} rows (sheet limit)", file=sys.stderr)
+                        continue
+                    for result in run_case(rows, cols, fmt, args.repeat, args.seed):
+                        line = json.dumps({**result, **meta})
+                        print(line, flush=True)
+                        if out is not None:
+                            out.write(line + "\n")
+    finally:
+        if out is not None:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
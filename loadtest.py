@@ -0,0 +1,244 @@
+"""Load test: concurrent uploads and report downloads against a locally started server.
+
+Starts the app (``python app.py`` unless --server-cmd or --url is given), replays a mix of
+generated CSV/xlsx uploads and report downloads from --concurrency threads for --duration
+seconds, samples the server's RSS, and prints a JSON summary, e.g.
+
+    python loadtest.py --concurrency 20 --duration 60
+    python loadtest.py --server-cmd "gunicorn -w 4 -b 127.0.0.1:{port} app:app" --concurrency 20
+    python loadtest.py --url http://127.0.0.1:5000 --mix upload_csv=2,upload_xlsx=1,download=4
+"""
+import argparse
+import json
+import os
+import random
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from typing import Dict, List, Tuple
+
+import bench
+
+MIMETYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _multipart(filename: str, payload: bytes, mimetype: str) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    head = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; "
+            f"filename=\"{filename}\"\r\nContent-Type: {mimetype}\r\n\r\n").encode()
+    return head + payload + f"\r\n--{boundary}--\r\n".encode(), f"multipart/form-data; boundary={boundary}"
+
+
+def _rss(pid: int) -> int | None:
+    # Resident set of the server and its children (gunicorn workers, job pool), Linux only
+    total = 0
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as fh:
+            pids += [int(p) for p in fh.read().split()]
+    except OSError:
+        pass
+    for p in pids:
+        try:
+            with open(f"/proc/{p}/status") as fh:
+                for line in fh:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+        except OSError:
+            continue
+    return total or None
+
+
+def _percentile(values: List[float], pct: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+class LoadTest:
+    def __init__(self, url: str, payloads: Dict[str, List[bytes]], mix: Dict[str, int],
+                 timeout: float):
+        self.url = url.rstrip("/")
+        self.payloads = payloads
+        self.ops = [op for op, weight in mix.items() for _ in range(weight)]
+        self.timeout = timeout
+        self.report_keys: List[str] = []
+        self.results: List[Tuple[str, float, float, int]] = []  # op, started, seconds, status
+        self.lock = threading.Lock()
+
+    def _request(self, req: urllib.request.Request) -> Tuple[int, bytes]:
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as res:
+                return res.status, res.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
+        except (urllib.error.URLError, OSError):
+            return 0, b""
+
+    def _upload(self, fmt: str, rng: random.Random) -> int:
+        payload = rng.choice(self.payloads[fmt])
+        body, content_type = _multipart(f"load.{fmt}", payload, MIMETYPES[fmt])
+        req = urllib.request.Request(self.url + "/api/upload", data=body, method="POST",
+                                     headers={"Content-Type": content_type})
+        status, data = self._request(req)
+        if status == 200:
+            with self.lock:
+                self.report_keys.append(json.loads(data)["report_key"])
+        return status
+
+    def _download(self, key: str) -> int:
+        return self._request(urllib.request.Request(f"{self.url}/api/report/{key}"))[0]
+
+    def worker(self, deadline: float, seed: int):
+        rng = random.Random(seed)
+        while time.monotonic() < deadline:
+            op = rng.choice(self.ops)
+            if op == "download":
+                with self.lock:
+                    key = rng.choice(self.report_keys) if self.report_keys else None
+                if key is None:  # nothing to download yet: upload one, timed as an upload
+                    op = "upload_csv"
+            start = time.monotonic()
+            if op == "download":
+                status = self._download(key)
+            else:
+                status = self._upload(op.split("_", 1)[1], rng)
+            with self.lock:
+                self.results.append((op, start, time.monotonic() - start, status))
+
+
+def _summarize(results: List[Tuple[str, float, float, int]], elapsed: float) -> dict:
+    summary = {}
+    for op in sorted({r[0] for r in results}) + ["all"]:
+        rows = [r for r in results if op == "all" or r[0] == op]
+        ok = [r[2] for r in rows if 200 <= r[3] < 300]
+        errors = len(rows) - len(ok)
+        summary[op] = {
+            "requests": len(rows),
+            "throughput_rps": round(len(rows) / elapsed, 2),
+            "error_rate": round(errors / len(rows), 4) if rows else 0.0,
+            "statuses": {str(s): sum(1 for r in rows if r[3] == s) for s in sorted({r[3] for r in rows})},
+            "p50_s": _percentile(ok, 50),
+            "p95_s": _percentile(ok, 95),
+            "p99_s": _percentile(ok, 99),
+            "mean_s": round(statistics.mean(ok), 4) if ok else None,
+        }
+    return summary
+
+
+def _wait_ready(url: str, proc: subprocess.Popen | None, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise SystemExit(f"server exited with {proc.returncode}")
+        try:
+            urllib.request.urlopen(url + "/metrics", timeout=2).read()
+            return
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    raise SystemExit("server did not come up")
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="target an already running server instead of starting one")
+    parser.add_argument("--server-cmd", default=f"{shlex.quote(sys.executable)} app.py",
+                        help="command to start the server; {port} is substituted (PORT is also set)")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--mix", default="upload_csv=2,upload_xlsx=1,download=3",
+                        help="weights for upload_csv, upload_xlsx and download")
+    parser.add_argument("--rows", default="20k", help="rows per generated upload")
+    parser.add_argument("--cols", type=int, default=20)
+    parser.add_argument("--payloads", type=int, default=8,
+                        help="distinct files per format; repeats exercise the upload memo")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--server-log", help="write the started server's output here (default: discard)")
+    parser.add_argument("--output", help="also write the JSON summary to this file")
+    args = parser.parse_args(argv)
+
+    mix = {}
+    for part in args.mix.split(","):
+        op, _, weight = part.partition("=")
+        if op not in ("upload_csv", "upload_xlsx", "download"):
+            parser.error(f"unknown operation in --mix: {op}")
+        mix[op] = int(weight or 1)
+
+    rows = bench._count(args.rows)
+    formats = {op.split("_", 1)[1] for op in mix if op.startswith("upload_")} | {"csv"}
+    print(f"generating {args.payloads} payload(s) per format…", file=sys.stderr)
+    payloads = {fmt: [bench.encode(bench.generate(rows, args.cols, args.seed + i), fmt)
+                      for i in range(args.payloads)] for fmt in sorted(formats)}
+
+    proc = None
+    url = args.url
+    if url is None:
+        port = _free_port()
+        url = f"http://127.0.0.1:{port}"
+        log = open(args.server_log, "ab") if args.server_log else subprocess.DEVNULL
+        proc = subprocess.Popen(shlex.split(args.server_cmd.format(port=port)),
+                                env={**os.environ, "PORT": str(port)},
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                stdout=log, stderr=subprocess.STDOUT)
+    try:
+        _wait_ready(url, proc)
+        test = LoadTest(url, payloads, mix, args.timeout)
+        rss: List[Tuple[float, int]] = []
+        start = time.monotonic()
+        deadline = start + args.duration
+        threads = [threading.Thread(target=test.worker, args=(deadline, args.seed + i), daemon=True)
+                   for i in range(args.concurrency)]
+        for t in threads:
+            t.start()
+        while any(t.is_alive() for t in threads):
+            if proc is not None:
+                sample = _rss(proc.pid)
+                if sample is not None:
+                    rss.append((round(time.monotonic() - start, 2), sample))
+            time.sleep(args.sample_interval)
+        elapsed = time.monotonic() - start
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    result = {
+        "config": {"url": url if args.url else None, "server_cmd": None if args.url else args.server_cmd,
+                   "concurrency": args.concurrency, "duration_s": args.duration, "mix": mix,
+                   "rows": rows, "cols": args.cols, "payloads": args.payloads},
+        "elapsed_s": round(elapsed, 2),
+        "operations": _summarize(test.results, elapsed),
+        "rss_bytes": {"peak": max((s for _, s in rss), default=None), "samples": rss},
+    }
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
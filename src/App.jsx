@@ -1,7 +1,10 @@
-import React, { useState } from 'react'
+import React, { useRef, useState } from 'react'
 import FileDrop from './components/FileDrop'
 import DataTable from './components/DataTable'
-import { uploadFile, reportUrl } from './lib/api'
+import { uploadFile, waitForJob, reportUrl } from './lib/api'
+
+// Larger files get an approximate preview first, replaced by the exact summary when it's ready
+const PREVIEW_MIN_BYTES = 20 * 1024 * 1024
 
 export default function App(){
   const [busy, setBusy] = useState(false)
@@ -9,16 +12,28 @@ export default function App(){
   const [result, setResult] = useState(null)
   const [fileName, setFileName] = useState('')
   const [downloading, setDownloading] = useState(false)
+  // The current upload; a newer file aborts it so its late result or error is dropped
+  const upload = useRef(null)
 
   async function handleFile(file){
+    upload.current?.abort()
+    const ctrl = new AbortController()
+    upload.current = ctrl
     setErr(''); setBusy(true); setResult(null); setFileName(file.name)
     try{
-      const data = await uploadFile(file)
-      setResult(data)
+      const data = await uploadFile(file, { preview: file.size >= PREVIEW_MIN_BYTES })
+      if (ctrl.signal.aborted) return
+      if (data.job_id){
+        if (data.approximate){ setResult(data); setBusy(false) }
+        const exact = await waitForJob(data.job_id, {}, ctrl.signal)
+        if (!ctrl.signal.aborted) setResult(exact)
+      }else{
+        setResult(data)
+      }
     }catch(e){
-      setErr(e.message || 'Upload failed')
+      if (!ctrl.signal.aborted) setErr(e.message || 'Upload failed')
     }finally{
-      setBusy(false)
+      if (upload.current === ctrl){ upload.current = null; setBusy(false) }
     }
   }
 
@@ -87,9 +102,15 @@ export default function App(){
           </div>
         )}
 
+        {result?.approximate && (
+          <div className="rounded-2xl border border-amber-800/60 bg-amber-950/30 text-amber-200 p-4 animate-fade-in">
+            Preview from the first {result.rows_sampled.toLocaleString()} rows of <span className="font-medium">{fileName}</span>; the exact summary replaces it when the full file has been processed…
+          </div>
+        )}
+
         {result && (
           <div className="space-y-6 animate-fade-in">
-            <div className="flex flex-wrap gap-3 items-center">
+            {!result.approximate && <div className="flex flex-wrap gap-3 items-center">
               <button
                 type="button"
                 onClick={handleDownload}
@@ -109,8 +130,10 @@ export default function App(){
                 </a>
               )}
               <div className="text-slate-400 text-sm">Includes Raw, Client Summary, Zone Summary</div>
-            </div>
-            <DataTable title="Zone × Client Summary" rows={result.client_summary} />
+            </div>}
+            {result.approximate
+              ? <DataTable title="Zone × Client Summary (preview)" rows={result.client_summary} />
+              : <DataTable title="Zone × Client Summary" reportKey={result.report_key} />}
             <DataTable title="Zone Rollup" rows={result.zone_summary} />
           </div>
         )}
@@ -1,19 +1,58 @@
-import React, { useMemo, useState } from 'react'
+import React, { useEffect, useMemo, useState } from 'react'
+import { fetchClientPage } from '../lib/api'
+
+const PAGE_SIZE = 100
 
 function toPct(v){
   if (v === null || v === undefined || Number.isNaN(v)) return ''
   return `${Math.round(Number(v))}%`
 }
 
-export default function DataTable({ rows, title }){
+// Rows come either from `rows` (filtered locally) or, when `reportKey` is set, from the
+// server one page at a time so large client summaries never live in the browser at once
+export default function DataTable({ rows, title, reportKey }){
   const [q, setQ] = useState('')
+  const [query, setQuery] = useState('')
+  const [offset, setOffset] = useState(0)
+  const [sort, setSort] = useState(null)
+  const [order, setOrder] = useState('asc')
+  const [page, setPage] = useState(null)
+  const [err, setErr] = useState('')
+
+  // Debounce typing so each keystroke doesn't fire a request
+  useEffect(()=>{
+    if (!reportKey) return
+    const t = setTimeout(()=>{ setQuery(q); setOffset(0) }, 250)
+    return ()=>clearTimeout(t)
+  }, [q, reportKey])
+
+  useEffect(()=>{ setOffset(0); setSort(null); setPage(null) }, [reportKey])
+
+  useEffect(()=>{
+    if (!reportKey) return
+    const ctrl = new AbortController()
+    fetchClientPage(reportKey, { offset, limit: PAGE_SIZE, sort, order, q: query }, ctrl.signal)
+      .then(data => { setPage(data); setErr('') })
+      .catch(e => { if (e.name !== 'AbortError') setErr(e.message || 'Failed to load rows') })
+    return ()=>ctrl.abort()
+  }, [reportKey, offset, sort, order, query])
+
   const filtered = useMemo(()=>{
+    if (reportKey) return page?.rows || []
     if (!q) return rows
     const needle = q.toLowerCase()
     return rows.filter(r => Object.values(r).some(v => String(v).toLowerCase().includes(needle)))
-  }, [q, rows])
+  }, [q, rows, reportKey, page])
+
+  const cols = reportKey ? (page?.columns || []) : (rows?.length ? Object.keys(rows[0]) : [])
+  const total = reportKey ? (page?.total || 0) : (rows?.length || 0)
 
-  const cols = rows?.length ? Object.keys(rows[0]) : []
+  function toggleSort(c){
+    if (!reportKey) return
+    if (sort === c) setOrder(order === 'asc' ? 'desc' : 'asc')
+    else { setSort(c); setOrder('asc') }
+    setOffset(0)
+  }
 
   return (
     <div className="glass rounded-2xl p-4 animate-fade-in">
@@ -26,12 +65,19 @@ export default function DataTable({ rows, title }){
           onChange={e=>setQ(e.target.value)}
         />
       </div>
+      {err && <div className="text-sm text-red-300 mb-2">{err}</div>}
       <div className="overflow-auto">
         <table className="min-w-full text-sm">
           <thead className="sticky top-0 z-10">
             <tr className="bg-slate-900/70 backdrop-blur supports-[backdrop-filter]:bg-slate-900/40">
               {cols.map(c => (
-                <th key={c} className="px-3 py-2 text-left whitespace-nowrap font-medium text-slate-300 border-b border-slate-800">{c}</th>
+                <th
+                  key={c}
+                  onClick={()=>toggleSort(c)}
+                  className={`px-3 py-2 text-left whitespace-nowrap font-medium text-slate-300 border-b border-slate-800 ${reportKey ? 'cursor-pointer select-none hover:text-slate-100' : ''}`}
+                >
+                  {c}{sort === c ? (order === 'asc' ? ' ▲' : ' ▼') : ''}
+                </th>
               ))}
             </tr>
           </thead>
@@ -45,12 +91,35 @@ export default function DataTable({ rows, title }){
                 ))}
               </tr>
             ))}
-            {!rows?.length && (
+            {!filtered?.length && (
               <tr><td className="px-3 py-6 text-slate-400">No data</td></tr>
             )}
           </tbody>
         </table>
       </div>
+      {reportKey && total > 0 && (
+        <div className="flex items-center justify-between mt-3 text-sm text-slate-400">
+          <span>{offset + 1}–{Math.min(offset + PAGE_SIZE, total)} of {total}</span>
+          <div className="flex gap-2">
+            <button
+              type="button"
+              disabled={offset === 0}
+              onClick={()=>setOffset(Math.max(offset - PAGE_SIZE, 0))}
+              className="px-3 py-1 rounded-lg border border-slate-700 hover:bg-slate-800 disabled:opacity-40"
+            >
+              Prev
+            </button>
+            <button
+              type="button"
+              disabled={offset + PAGE_SIZE >= total}
+              onClick={()=>setOffset(offset + PAGE_SIZE)}
+              className="px-3 py-1 rounded-lg border border-slate-700 hover:bg-slate-800 disabled:opacity-40"
+            >
+              Next
+            </button>
+          </div>
+        </div>
+      )}
     </div>
   )
 }
@@ -1,11 +1,40 @@
-export async function uploadFile(file) {
+// The client table pages from /api/summary/<key>/clients, so the exact result leaves it out
+export async function uploadFile(file, { preview = false } = {}) {
   const form = new FormData()
   form.append('file', file)
-  const res = await fetch('/api/upload', { method: 'POST', body: form })
+  const params = new URLSearchParams({ clients: '0' })
+  if (preview) params.set('preview', 'true')
+  const res = await fetch(`/api/upload?${params}`, { method: 'POST', body: form })
   if (!res.ok) throw new Error(await res.text())
   return res.json()
 }
 
+// Poll an async upload until its exact summary is ready; aborting the signal stops polling
+export async function waitForJob(jobId, { interval = 1000 } = {}, signal) {
+  for (;;) {
+    const res = await fetch(`/api/jobs/${jobId}/result`, { signal })
+    if (res.status === 200) return res.json()
+    if (res.status !== 202) throw new Error(await res.text())
+    await new Promise((resolve, reject) => {
+      const timer = setTimeout(resolve, interval)
+      signal?.addEventListener('abort', () => {
+        clearTimeout(timer)
+        reject(new DOMException('Aborted', 'AbortError'))
+      }, { once: true })
+    })
+  }
+}
+
 export function reportUrl(key) {
   return `/api/report/${key}`
 }
+
+export async function fetchClientPage(key, { offset = 0, limit = 100, sort, order, q } = {}, signal) {
+  const params = new URLSearchParams({ offset, limit })
+  if (sort) params.set('sort', sort)
+  if (order) params.set('order', order)
+  if (q) params.set('q', q)
+  const res = await fetch(`/api/summary/${key}/clients?${params}`, { signal })
+  if (!res.ok) throw new Error(await res.text())
+  return res.json()
+}